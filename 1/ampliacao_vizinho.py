@@ -3,7 +3,9 @@ from PIL import Image
 import numpy as np
 import matplotlib.pyplot as plt
 import os
-from typing import Tuple, Union
+from typing import Iterator, Tuple, Union
+
+from reamostragem import get_resample_plan
 
 def load_pil_image(file_path: str) -> Union[Image.Image, None]:
     """
@@ -52,17 +54,23 @@ def pil_to_numpy_array(image: Image.Image, dtype: type = np.uint8) -> np.ndarray
     """
     return np.array(image, dtype=dtype)
 
-def numpy_array_to_pil_image(pixels_array: np.ndarray) -> Image.Image:
+def numpy_array_to_pil_image(pixels_array: Union[np.ndarray, 'LazyUpsampledImage']) -> Image.Image:
     """
     Converte um array NumPy de pixels de volta para uma imagem PIL.
     Assume que o array de entrada já está no tipo de dados correto (ex: uint8 para salvar).
 
+    Também aceita uma LazyUpsampledImage; nesse caso a imagem ampliada inteira é
+    materializada. Para pré-visualizar zooms grandes, recorte antes
+    (`numpy_array_to_pil_image(lazy[y0:y1, x0:x1])`), assim só o recorte é alocado.
+
     Args:
         pixels_array: O array NumPy de pixels (espera-se uint8 para conversão direta).
 
     Returns:
         A imagem PIL correspondente.
     """
+    if isinstance(pixels_array, LazyUpsampledImage):
+        pixels_array = np.asarray(pixels_array)
     # Se o array for float, clip e converta para uint8
     if pixels_array.dtype != np.uint8:
         pixels_array = np.clip(pixels_array, 0, 255).astype(np.uint8)
@@ -82,25 +90,180 @@ def pil_to_grayscale_pil(image: Image.Image) -> Image.Image:
         return image
     return image.convert('L')
 
-def upsample_nearest_neighbor(source_pixels: np.ndarray, scale_factor: int) -> np.ndarray:
+class LazyUpsampledImage:
+    """
+    Ampliação por vizinho mais próximo sem materializar a imagem ampliada.
+
+    Guarda apenas uma referência somente leitura à imagem original e o fator de
+    escala. Recortes (`lazy[y0:y1, x0:x1]`) e blocos de `tiles()` são calculados
+    sob demanda a partir dos pixels de origem, então só a região pedida é alocada.
+    Isso permite pré-visualizar zooms de 8x ou 16x de imagens grandes sem esgotar
+    a memória.
+
+    Os índices aceitos são inteiros, fatias e reticências (`...`); índices por
+    array levantam IndexError, já que exigiriam materializar a imagem.
+
+    Atributos:
+        source: Visão somente leitura da imagem original (H, W) ou (H, W, C).
+        scale_factor: Fator de ampliação inteiro.
+        shape: Shape da imagem ampliada (H * fator, W * fator[, C]).
+        dtype: dtype dos pixels.
+    """
+
+    def __init__(self, source_pixels: np.ndarray, scale_factor: int):
+        self.source = source_pixels.view()
+        self.source.flags.writeable = False
+        self.scale_factor = scale_factor
+        height, width = source_pixels.shape[:2]
+        self.shape = (height * scale_factor, width * scale_factor) + source_pixels.shape[2:]
+        self.dtype = source_pixels.dtype
+        self.ndim = source_pixels.ndim
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def block_view(self) -> np.ndarray:
+        """
+        Retorna uma visão por broadcast (sem cópia) da imagem ampliada.
+
+        O shape é (H, fator, W, fator[, C]): o pixel ampliado (y, x) corresponde a
+        `view[y // fator, y % fator, x // fator, x % fator]`. A visão é somente leitura.
+        """
+        source = self.source[:, np.newaxis, :, np.newaxis]
+        height, width = self.source.shape[:2]
+        factor = self.scale_factor
+        return np.broadcast_to(source, (height, factor, width, factor) + self.source.shape[2:])
+
+    def __getitem__(self, key) -> np.ndarray:
+        if not isinstance(key, tuple):
+            key = (key,)
+        # Reticências viram fatias completas nos eixos que faltam
+        ellipsis_positions = [position for position, axis_key in enumerate(key) if axis_key is Ellipsis]
+        if len(ellipsis_positions) > 1:
+            raise IndexError("Um índice só pode ter uma reticência (...).")
+        if ellipsis_positions:
+            position = ellipsis_positions[0]
+            missing_axes = max(self.ndim - (len(key) - 1), 0)
+            key = key[:position] + (slice(None),) * missing_axes + key[position + 1:]
+        for axis_key in key:
+            if not isinstance(axis_key, (slice, int, np.integer)):
+                raise IndexError(f"Índice não suportado em LazyUpsampledImage: {type(axis_key).__name__}. "
+                                 "Use inteiros, fatias ou '...'; para índices por array, "
+                                 "materialize a imagem com np.asarray(imagem)[índice].")
+        if len(key) > self.ndim:
+            raise IndexError(f"Índices demais para uma imagem com {self.ndim} dimensões.")
+        key = key + (slice(None),) * (self.ndim - len(key))
+
+        # Converte os índices das linhas e colunas ampliadas em índices da origem
+        source_indices = []
+        for axis in (0, 1):
+            axis_key = key[axis]
+            if isinstance(axis_key, slice):
+                positions = np.arange(*axis_key.indices(self.shape[axis]))
+            else:
+                position = int(axis_key)
+                if not -self.shape[axis] <= position < self.shape[axis]:
+                    raise IndexError(f"Índice {position} fora dos limites do eixo {axis} ({self.shape[axis]}).")
+                positions = position % self.shape[axis]
+            source_indices.append(positions // self.scale_factor)
+
+        rows, cols = source_indices
+        if np.ndim(rows) and np.ndim(cols):
+            region = self.source[np.ix_(rows, cols)]
+        else:
+            region = self.source[rows, cols]
+        if self.ndim == 3:
+            region = region[..., key[2]]
+        return region
+
+    def tiles(self, tile_size: int) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """
+        Percorre a imagem ampliada em blocos quadrados, materializando um por vez.
+
+        Args:
+            tile_size: Lado do bloco em pixels da imagem ampliada.
+
+        Yields:
+            Tuplas (y, x, bloco), com (y, x) o canto superior esquerdo do bloco.
+        """
+        if tile_size <= 0:
+            raise ValueError("O tamanho do bloco deve ser positivo.")
+        height, width = self.shape[:2]
+        for y in range(0, height, tile_size):
+            for x in range(0, width, tile_size):
+                yield y, x, self[y:y + tile_size, x:x + tile_size]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        # Materializa a imagem inteira (usado por np.asarray / np.array). Pelo protocolo
+        # do NumPy 2, copy=False exige não copiar: só é possível com fator 1 e o mesmo dtype.
+        no_copy_possible = self.scale_factor == 1 and (dtype is None or np.dtype(dtype) == self.dtype)
+        if copy is False:
+            if not no_copy_possible:
+                raise ValueError("LazyUpsampledImage não pode ser convertida sem materializar a "
+                                 "imagem ampliada (copy=False); use np.asarray sem copy=False.")
+            return self.source
+        amplified = upsample_nearest_neighbor(self.source, self.scale_factor)
+        return amplified if dtype is None else amplified.astype(dtype)
+
+def upsample_nearest_neighbor(source_pixels: np.ndarray, scale_factor: int,
+                              reuse_output: bool = False,
+                              lazy: bool = False) -> Union[np.ndarray, LazyUpsampledImage]:
     """
-    Realiza a ampliação da imagem por vizinho mais próximo usando NumPy.repeat.
+    Realiza a ampliação da imagem por vizinho mais próximo.
+
+    Os índices de origem de cada linha e coluna ficam em um ResamplePlan em cache
+    (ver reamostragem.py), então ampliações repetidas da mesma geometria não
+    recalculam o mapeamento de coordenadas.
 
     Args:
         source_pixels: Array NumPy da imagem original (H, W) ou (H, W, C), dtype=np.uint8.
         scale_factor: Fator de escala inteiro para a ampliação.
+        reuse_output: Se True, escreve o resultado no buffer de saída pré-alocado do
+                      plano, que é sobrescrito na próxima chamada com a mesma geometria.
+        lazy: Se True, não aloca a imagem ampliada e retorna uma LazyUpsampledImage,
+              que calcula recortes e blocos sob demanda.
 
     Returns:
-        Array NumPy com a imagem ampliada, dtype=np.uint8.
+        Array NumPy com a imagem ampliada, dtype=np.uint8, ou uma LazyUpsampledImage
+        se lazy=True.
     """
     if not isinstance(scale_factor, int) or scale_factor < 1:
         raise ValueError("O fator de escala deve ser um inteiro positivo.")
     if source_pixels.ndim not in [2, 3]:
         raise ValueError("A imagem de entrada deve ser 2D (escala de cinza) ou 3D (colorida).")
 
-    # Repete os pixels ao longo do eixo das linhas (0) e depois das colunas (1)
-    amplified_pixels = source_pixels.repeat(scale_factor, axis=0).repeat(scale_factor, axis=1)
-    return amplified_pixels
+    if lazy:
+        return LazyUpsampledImage(source_pixels, scale_factor)
+
+    source_height, source_width = source_pixels.shape[:2]
+    target_hw = (source_height * scale_factor, source_width * scale_factor)
+    plan = get_resample_plan(source_pixels, target_hw, 'nearest')
+    out = None if reuse_output else np.empty(plan.target_shape, dtype=source_pixels.dtype)
+    return plan.execute(source_pixels, out=out)
+
+def upsample_nearest_neighbor_batch(source_stack: np.ndarray, scale_factor: int) -> np.ndarray:
+    """
+    Amplia todas as imagens de uma pilha por vizinho mais próximo em uma única passagem.
+
+    Usa um único ResamplePlan para a pilha inteira, então o custo fixo (tabelas e
+    alocação) é pago uma vez, e não uma vez por quadro.
+
+    Args:
+        source_stack: Array NumPy (N, H, W) ou (N, H, W, C).
+        scale_factor: Fator de escala inteiro para a ampliação.
+
+    Returns:
+        Array NumPy contíguo (N, H * fator, W * fator[, C]) com o dtype da entrada.
+    """
+    if not isinstance(scale_factor, int) or scale_factor < 1:
+        raise ValueError("O fator de escala deve ser um inteiro positivo.")
+    if source_stack.ndim not in [3, 4]:
+        raise ValueError("A pilha de entrada deve ser 3D (N, H, W) ou 4D (N, H, W, C).")
+
+    source_height, source_width = source_stack.shape[1:3]
+    target_hw = (source_height * scale_factor, source_width * scale_factor)
+    plan = get_resample_plan(source_stack, target_hw, 'nearest', batched=True)
+    return plan.execute(source_stack, out=np.empty(plan.target_shape, dtype=source_stack.dtype))
 
 def plot_comparison_images(original_color: Image.Image, 
                            original_gray: Image.Image, 
@@ -103,46 +103,57 @@ def upsample_2x_custom_bilinear(source_pixels: np.ndarray) -> np.ndarray:
     target_height = source_height * 2
     target_width = source_width * 2
 
-    if source_pixels.ndim == 3: # Imagem colorida
-        channels = source_pixels.shape[2]
-        target_pixels = np.zeros((target_height, target_width, channels), dtype=np.float32)
-    else: # Imagem em escala de cinza
-        channels = 1
-        target_pixels = np.zeros((target_height, target_width), dtype=np.float32)
-
-    for i_target in range(0, target_height, 2):
-        for j_target in range(0, target_width, 2):
-            # Índices correspondentes na imagem original
-            i_source = i_target // 2
-            j_source = j_target // 2
-
-            # Índices dos vizinhos na imagem original, com tratamento de bordas
-            i_source_plus_1 = min(i_source + 1, source_height - 1)
-            j_source_plus_1 = min(j_source + 1, source_width - 1)
-
-            # Pegar os quatro pixels vizinhos da imagem original
-            p_ij = source_pixels[i_source, j_source]
-            p_i1j = source_pixels[i_source_plus_1, j_source]
-            p_ij1 = source_pixels[i_source, j_source_plus_1]
-            p_i1j1 = source_pixels[i_source_plus_1, j_source_plus_1]
-            
-            # Atribuindo os valores aos novos pixels no bloco 2x2 de destino
-            target_pixels[i_target, j_target] = p_ij  # Ponto original (top-left)
-            
-            # Ponto interpolado 'a' (top-right)
-            val_a = (p_ij + p_ij1) / 2.0
-            target_pixels[i_target, j_target + 1] = val_a
-            
-            # Ponto interpolado 'b' (bottom-left)
-            val_b = (p_ij + p_i1j) / 2.0
-            target_pixels[i_target + 1, j_target] = val_b
-            
-            # Ponto interpolado 'c' (bottom-right)
-            val_c = (p_ij + p_ij1 + p_i1j + p_i1j1) / 4.0
-            target_pixels[i_target + 1, j_target + 1] = val_c
+    # Todas as posições do destino são escritas abaixo, então não é preciso zerar o array
+    target_pixels = np.empty((target_height, target_width) + source_pixels.shape[2:], dtype=np.float32)
+
+    # Vizinhos de baixo e da direita de cada pixel original, replicando a última linha/coluna
+    # na borda (equivale a min(i + 1, H - 1) e min(j + 1, W - 1))
+    p_ij = source_pixels
+    p_i1j = np.concatenate((source_pixels[1:], source_pixels[-1:]), axis=0)
+    p_ij1 = np.concatenate((source_pixels[:, 1:], source_pixels[:, -1:]), axis=1)
+    p_i1j1 = np.concatenate((p_i1j[:, 1:], p_i1j[:, -1:]), axis=1)
+
+    # Cada fase do bloco 2x2 de destino é preenchida de uma só vez com fatiamento com passo 2.
+    # As operações seguem a mesma ordem da versão pixel a pixel, garantindo resultado idêntico.
+    target_pixels[0::2, 0::2] = p_ij                                # Ponto original (top-left)
+    target_pixels[0::2, 1::2] = (p_ij + p_ij1) / 2.0                # Ponto 'a' (top-right)
+    target_pixels[1::2, 0::2] = (p_ij + p_i1j) / 2.0                # Ponto 'b' (bottom-left)
+    target_pixels[1::2, 1::2] = (p_ij + p_ij1 + p_i1j + p_i1j1) / 4.0  # Ponto 'c' (bottom-right)
             
     return target_pixels
 
+def upsample_2x_custom_bilinear_fixed(source_pixels: np.ndarray) -> np.ndarray:
+    """
+    Versão inteira de `upsample_2x_custom_bilinear` para imagens uint8.
+
+    As somas dos vizinhos são feitas em uint16 e as médias por deslocamento de bits
+    (>> 1 e >> 2), sem passar por float32. O resultado é idêntico ao de
+    `numpy_to_pil_image(upsample_2x_custom_bilinear(...))`, que trunca as médias,
+    mas usa um quarto da memória intermediária.
+
+    Args:
+        source_pixels: Array NumPy (H, W) ou (H, W, C) da imagem original (dtype uint8).
+
+    Returns:
+        Array NumPy (2*H, 2*W) ou (2*H, 2*W, C) com a imagem ampliada (dtype uint8).
+    """
+    if source_pixels.dtype != np.uint8:
+        raise ValueError("A versão inteira espera uma imagem uint8.")
+
+    source_height, source_width = source_pixels.shape[:2]
+    target_pixels = np.empty((source_height * 2, source_width * 2) + source_pixels.shape[2:], dtype=np.uint8)
+
+    p_ij = source_pixels.astype(np.uint16)
+    p_i1j = np.concatenate((p_ij[1:], p_ij[-1:]), axis=0)
+    p_ij1 = np.concatenate((p_ij[:, 1:], p_ij[:, -1:]), axis=1)
+    p_i1j1 = np.concatenate((p_i1j[:, 1:], p_i1j[:, -1:]), axis=1)
+
+    target_pixels[0::2, 0::2] = source_pixels
+    target_pixels[0::2, 1::2] = (p_ij + p_ij1) >> 1
+    target_pixels[1::2, 0::2] = (p_ij + p_i1j) >> 1
+    target_pixels[1::2, 1::2] = (p_ij + p_ij1 + p_i1j + p_i1j1) >> 2
+    return target_pixels
+
 def plot_comparison_images(original_color: Image.Image, 
                            original_gray: Image.Image, 
                            amplified_gray: Image.Image, 
@@ -204,19 +215,20 @@ if __name__ == '__main__':
             # gray_output_path = os.path.join(output_dir, f"{os.path.splitext(input_image_name)[0]}_gray.jpeg")
             # save_pil_image(gray_pil, gray_output_path)
 
-            # 2. Converter imagem cinza para array NumPy float32 para processamento
+            # 2. Converter imagem cinza para array NumPy uint8 para processamento
+            # (o caminho inteiro evita a cópia float32, 4x maior que a imagem)
             print("Convertendo imagem cinza para array NumPy...")
-            gray_numpy_float32 = pil_to_numpy_float32(gray_pil)
+            gray_numpy_uint8 = np.asarray(gray_pil, dtype=np.uint8)
 
             # 3. Aplicar ampliação 2x customizada
             # Para uma interpolação bilinear mais geral e otimizada, considere:
             # amplified_pil = gray_pil.resize((gray_pil.width * 2, gray_pil.height * 2), Image.Resampling.BILINEAR)
             print("Aplicando ampliação 2x customizada...")
-            amplified_numpy_float32 = upsample_2x_custom_bilinear(gray_numpy_float32)
+            amplified_numpy_uint8 = upsample_2x_custom_bilinear_fixed(gray_numpy_uint8)
 
             # 4. Converter array NumPy ampliado de volta para imagem PIL
             print("Convertendo array ampliado para imagem PIL...")
-            amplified_pil = numpy_to_pil_image(amplified_numpy_float32)
+            amplified_pil = numpy_to_pil_image(amplified_numpy_uint8)
 
             # 5. Salvar a imagem ampliada
             amplified_image_filename = f"{os.path.splitext(input_image_name)[0]}_ampliado_2x_custom.jpeg"
@@ -0,0 +1,71 @@
+import os
+import time
+import numpy as np
+from typing import List, Tuple
+
+from reducao_bilinear import bilinear_interpolation, get_bilinear_path_stats
+
+# Geometria do teste: uma digitalização grande reduzida para pouco menos de 1/3 em cada eixo.
+# A razão não é inteira de propósito: com fator exato, bilinear_interpolation usaria a
+# média de blocos (box average), e o que se quer medir é a interpolação bilinear em faixas.
+SOURCE_SHAPE = (12000, 9000)
+TARGET_SIZE_WH = (3001, 4001)
+REPETITIONS = 3
+
+# --- Medição ---
+
+def time_bilinear(pixels: np.ndarray, new_size_wh: Tuple[int, int], workers: int,
+                  repetitions: int = REPETITIONS) -> float:
+    """
+    Mede o melhor tempo de `bilinear_interpolation` com um número de threads.
+
+    A primeira chamada (fora da medição) cria o plano em cache, então só o
+    cálculo da reamostragem entra no tempo.
+
+    Args:
+        pixels: Imagem de origem (uint8).
+        new_size_wh: Tupla (nova_largura, nova_altura).
+        workers: Número de threads (1 = execução sequencial).
+        repetitions: Quantas medições fazer; vale a menor.
+
+    Returns:
+        Melhor tempo em segundos.
+    """
+    bilinear_interpolation(pixels, new_size_wh, workers=workers)
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        bilinear_interpolation(pixels, new_size_wh, workers=workers)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def worker_counts(max_workers: int) -> List[int]:
+    """Potências de 2 até o número de núcleos, mais o próprio número de núcleos."""
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+# --- Bloco de Execução Principal ---
+
+if __name__ == '__main__':
+    cpu_count = os.cpu_count() or 1
+    print(f"Núcleos disponíveis: {cpu_count}")
+    print(f"Redução bilinear {SOURCE_SHAPE} -> {TARGET_SIZE_WH[::-1]}, melhor de {REPETITIONS} execuções")
+
+    rng = np.random.default_rng(0)
+    source = rng.integers(0, 256, SOURCE_SHAPE, dtype=np.uint8)
+
+    reference = bilinear_interpolation(source, TARGET_SIZE_WH)
+    baseline = None
+    print(f"{'threads':>8} {'tempo (s)':>10} {'aceleração':>11} {'eficiência':>11}")
+    for workers in worker_counts(cpu_count):
+        elapsed = time_bilinear(source, TARGET_SIZE_WH, workers)
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>8} {elapsed:>10.3f} {speedup:>10.2f}x {speedup / workers:>10.0%}")
+        if not np.array_equal(bilinear_interpolation(source, TARGET_SIZE_WH, workers=workers), reference):
+            print(f"Aviso: resultado com {workers} threads difere do sequencial.")
+    print(f"Caminhos usados: {get_bilinear_path_stats()}")
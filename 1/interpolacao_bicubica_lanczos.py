@@ -0,0 +1,172 @@
+import os
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+import matplotlib.pyplot as plt
+from typing import Tuple, Union
+
+from reamostragem import get_resample_plan
+
+# --- Funções Auxiliares Padronizadas ---
+
+def load_pil_image(file_path: str) -> Union[Image.Image, None]:
+    """
+    Carrega uma imagem a partir do caminho do arquivo usando Pillow.
+
+    Args:
+        file_path: Caminho para o arquivo de imagem.
+
+    Returns:
+        Um objeto Image da PIL se o carregamento for bem-sucedido, None caso contrário.
+    """
+    try:
+        img = Image.open(file_path)
+        return img
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de imagem não encontrado em '{file_path}'.")
+    except UnidentifiedImageError:
+        print(f"Erro: Não foi possível identificar o arquivo de imagem. Pode estar corrompido ou não ser um formato suportado: '{file_path}'.")
+    except Exception as e:
+        print(f"Um erro inesperado ocorreu ao carregar a imagem '{file_path}': {e}")
+    return None
+
+def save_numpy_as_image(array: np.ndarray, file_path: str) -> None:
+    """
+    Salva um array NumPy (uint8) como um arquivo de imagem usando Pillow.
+
+    Args:
+        array: O array NumPy representando a imagem.
+        file_path: Caminho para salvar o arquivo de imagem.
+    """
+    try:
+        Image.fromarray(array.astype(np.uint8)).save(file_path)
+        print(f"Imagem salva com sucesso em '{file_path}'.")
+    except Exception as e:
+        print(f"Erro ao salvar imagem em '{file_path}': {e}")
+
+# --- Funções Principais de Interpolação ---
+
+def resize_with_kernel(pixels: np.ndarray, new_size_wh: Tuple[int, int], method: str) -> np.ndarray:
+    """
+    Redimensiona uma imagem por convolução separável com um núcleo de interpolação.
+
+    As matrizes de pesos de cada eixo são em banda (só os pixels dentro do suporte
+    do núcleo), pré-calculadas uma vez e guardadas no cache de planos de
+    reamostragem.py. As linhas são filtradas primeiro e depois as colunas, com
+    operações sobre o array inteiro, para imagens em cinza (H, W) ou coloridas (H, W, C).
+
+    Args:
+        pixels: Array NumPy da imagem de origem (uint8).
+        new_size_wh: Tupla (nova_largura, nova_altura).
+        method: 'bicubic' ou 'lanczos3'.
+
+    Returns:
+        Array NumPy uint8 com a imagem redimensionada.
+
+    Raises:
+        ValueError: Se as dimensões forem inválidas.
+    """
+    new_width, new_height = new_size_wh
+    if new_width <= 0 or new_height <= 0:
+        raise ValueError("As novas dimensões (largura e altura) devem ser positivas.")
+    if pixels.ndim not in (2, 3):
+        raise ValueError(f"A imagem deve ser 2D ou 3D, recebido ndim={pixels.ndim}.")
+
+    plan = get_resample_plan(pixels, (new_height, new_width), method)
+    return plan.execute(pixels, out=np.empty(plan.target_shape, dtype=np.uint8))
+
+def bicubic_interpolation(pixels: np.ndarray, new_size_wh: Tuple[int, int]) -> np.ndarray:
+    """
+    Redimensiona uma imagem com interpolação bicúbica (núcleo de Keys, a = -0.5).
+
+    Args:
+        pixels: Array NumPy da imagem de origem, (H, W) ou (H, W, C).
+        new_size_wh: Tupla (nova_largura, nova_altura).
+
+    Returns:
+        Array NumPy uint8 com a imagem redimensionada.
+    """
+    return resize_with_kernel(pixels, new_size_wh, 'bicubic')
+
+def lanczos_interpolation(pixels: np.ndarray, new_size_wh: Tuple[int, int]) -> np.ndarray:
+    """
+    Redimensiona uma imagem com interpolação de Lanczos de 3 lóbulos.
+
+    Args:
+        pixels: Array NumPy da imagem de origem, (H, W) ou (H, W, C).
+        new_size_wh: Tupla (nova_largura, nova_altura).
+
+    Returns:
+        Array NumPy uint8 com a imagem redimensionada.
+    """
+    return resize_with_kernel(pixels, new_size_wh, 'lanczos3')
+
+# --- Função de Plotagem ---
+
+def plot_interpolation_comparison(
+    original_array: np.ndarray,
+    bicubic_array: np.ndarray,
+    lanczos_array: np.ndarray,
+    output_path: Union[str, None] = None
+) -> None:
+    """
+    Plota a imagem original e os resultados bicúbico e Lanczos lado a lado.
+
+    Args:
+        original_array: Array NumPy da imagem original.
+        bicubic_array: Array NumPy da imagem redimensionada por bicúbica.
+        lanczos_array: Array NumPy da imagem redimensionada por Lanczos.
+        output_path: Caminho opcional para salvar o plot.
+    """
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    titles = ['Original', 'Bicúbica', 'Lanczos-3']
+    images = [original_array, bicubic_array, lanczos_array]
+
+    for axis, title, img in zip(axes, titles, images):
+        axis.imshow(img, cmap='gray' if img.ndim == 2 else None, vmin=0, vmax=255)
+        axis.set_title(f"{title}\nShape: {img.shape}")
+        axis.axis('off')
+
+    plt.tight_layout()
+    if output_path:
+        try:
+            plt.savefig(output_path)
+            print(f"Plot salvo com sucesso em '{output_path}'.")
+        except Exception as e:
+            print(f"Erro ao salvar o plot em '{output_path}': {e}")
+    plt.show()
+
+# --- Bloco de Execução Principal ---
+
+if __name__ == '__main__':
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    input_image_filename = "brat.jpeg"
+    input_image_path = os.path.join(script_dir, input_image_filename)
+
+    output_dir_path = os.path.join(script_dir, "resultados_bicubica_lanczos")
+    os.makedirs(output_dir_path, exist_ok=True)
+
+    print(f"Carregando imagem: '{input_image_path}'...")
+    pil_image = load_pil_image(input_image_path)
+
+    if pil_image:
+        gray_numpy = np.array(pil_image.convert('L'))
+        target_size_wh = (gray_numpy.shape[1] // 2, gray_numpy.shape[0] // 2)
+        base_name = os.path.splitext(input_image_filename)[0]
+
+        try:
+            print(f"Redimensionando para {target_size_wh} (bicúbica e Lanczos-3)...")
+            bicubic_numpy = bicubic_interpolation(gray_numpy, target_size_wh)
+            lanczos_numpy = lanczos_interpolation(gray_numpy, target_size_wh)
+
+            save_numpy_as_image(bicubic_numpy, os.path.join(output_dir_path, f"{base_name}_bicubica.jpeg"))
+            save_numpy_as_image(lanczos_numpy, os.path.join(output_dir_path, f"{base_name}_lanczos.jpeg"))
+
+            plot_interpolation_comparison(
+                gray_numpy, bicubic_numpy, lanczos_numpy,
+                output_path=os.path.join(output_dir_path, f"plot_{base_name}_bicubica_lanczos.png")
+            )
+            print("Processamento concluído.")
+        except ValueError as ve:
+            print(f"Erro de valor: {ve}")
+    else:
+        print(f"Não foi possível carregar a imagem '{input_image_path}'. Encerrando script.")
@@ -0,0 +1,143 @@
+import os
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+from typing import Dict, List, Sequence, Tuple, Union
+
+from reamostragem import get_resample_plan
+
+# Tamanho pedido: lado maior em pixels (mantém a proporção) ou (largura, altura) exatos
+ThumbnailSize = Union[int, Tuple[int, int]]
+
+# --- Cálculo dos Tamanhos ---
+
+def resolve_target_size(size: ThumbnailSize, source_hw: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Converte um tamanho pedido em (altura, largura) de destino.
+
+    Args:
+        size: Inteiro com o lado maior em pixels (a proporção da origem é mantida)
+              ou tupla (largura, altura).
+        source_hw: Tupla (altura, largura) da imagem de origem.
+
+    Returns:
+        Tupla (altura, largura) de destino, com cada lado >= 1.
+
+    Raises:
+        ValueError: Se o tamanho não for positivo ou o par não tiver dois valores.
+    """
+    if isinstance(size, (tuple, list)):
+        if len(size) != 2:
+            raise ValueError(f"Tamanho de miniatura inválido: {size}; use (largura, altura).")
+        width, height = int(size[0]), int(size[1])
+    else:
+        longest = int(size)
+        if longest <= 0:
+            raise ValueError(f"Tamanho de miniatura inválido: {size}.")
+        source_height, source_width = source_hw
+        scale = longest / max(source_height, source_width)
+        height = max(1, int(round(source_height * scale)))
+        width = max(1, int(round(source_width * scale)))
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Tamanho de miniatura inválido: {size}.")
+    return height, width
+
+# --- Geração de Várias Saídas ---
+
+def resize_to_many(pixels: np.ndarray, sizes: Sequence[ThumbnailSize],
+                   method: str = 'area') -> Dict[ThumbnailSize, np.ndarray]:
+    """
+    Gera várias reduções de uma mesma imagem, cada uma a partir da anterior maior.
+
+    Os tamanhos são processados do maior para o menor. Cada saída é calculada a
+    partir do menor resultado já pronto que ainda seja maior ou igual a ela nos
+    dois eixos (ou da origem, se nenhum for), e não sempre da resolução total.
+    Assim o custo total fica próximo ao da maior saída: cada passo lê uma imagem
+    apenas um pouco maior que a que escreve.
+
+    Args:
+        pixels: Array NumPy uint8 (H, W) ou (H, W, C), já decodificado.
+        sizes: Tamanhos pedidos (veja `resolve_target_size`); pares em lista
+               ([512, 384]) são tratados como tuplas.
+        method: Método de reamostragem do plano ('area', 'bilinear', 'bicubic', ...).
+                'area' (padrão) é o que melhor evita serrilhado em reduções.
+
+    Returns:
+        Dicionário {tamanho pedido: array uint8}, na ordem em que os tamanhos foram
+        pedidos, com pares sempre como tuplas (largura, altura).
+
+    Raises:
+        ValueError: Se a imagem ou algum tamanho for inválido.
+    """
+    if pixels.ndim not in (2, 3):
+        raise ValueError(f"A imagem deve ser 2D ou 3D, recebido shape {pixels.shape}.")
+    source_hw = pixels.shape[:2]
+    # Listas não servem de chave de dicionário: cada par vira uma tupla
+    sizes = [tuple(size) if isinstance(size, list) else size for size in sizes]
+    targets = {size: resolve_target_size(size, source_hw) for size in sizes}
+
+    # Intermediários disponíveis como fonte, do maior para o menor
+    intermediates: List[np.ndarray] = [pixels]
+    results: Dict[ThumbnailSize, np.ndarray] = {}
+    for size in sorted(targets, key=lambda s: targets[s][0] * targets[s][1], reverse=True):
+        target_hw = targets[size]
+        source = pixels
+        for candidate in intermediates:
+            if candidate.shape[0] >= target_hw[0] and candidate.shape[1] >= target_hw[1]:
+                source = candidate
+        if source.shape[:2] == target_hw:
+            results[size] = source
+            continue
+        plan = get_resample_plan(source, target_hw, method)
+        results[size] = plan.execute(source, out=np.empty(plan.target_shape, dtype=np.uint8))
+        # Ampliações não servem de fonte: não trazem detalhe novo e somariam o borrado da interpolação
+        if target_hw[0] <= source_hw[0] and target_hw[1] <= source_hw[1]:
+            intermediates.append(results[size])
+
+    return {size: results[size] for size in sizes}
+
+def generate_thumbnails(file_path: str, sizes: Sequence[ThumbnailSize],
+                        method: str = 'area', grayscale: bool = True) -> Dict[ThumbnailSize, np.ndarray]:
+    """
+    Decodifica uma imagem uma única vez e gera todas as miniaturas pedidas.
+
+    Args:
+        file_path: Caminho para o arquivo de imagem.
+        sizes: Tamanhos pedidos (ex.: [1024, 512, 256, 128]).
+        method: Método de reamostragem (veja `resize_to_many`).
+        grayscale: Se True (padrão, como os scripts de redução), converte para
+                   tons de cinza uma vez antes de reduzir.
+
+    Returns:
+        Dicionário {tamanho pedido: array uint8}.
+
+    Raises:
+        FileNotFoundError, UnidentifiedImageError: Se a imagem não puder ser lida.
+    """
+    with Image.open(file_path) as pil_image:
+        pil_image = pil_image.convert('L') if grayscale else pil_image.convert('RGB')
+        pixels = np.asarray(pil_image, dtype=np.uint8)
+    return resize_to_many(pixels, sizes, method)
+
+# --- Bloco de Execução Principal ---
+
+if __name__ == '__main__':
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    input_image_filename = "brat.jpeg"
+    input_image_path = os.path.join(script_dir, input_image_filename)
+
+    output_dir_path = os.path.join(script_dir, "resultados_miniaturas")
+    os.makedirs(output_dir_path, exist_ok=True)
+
+    base_name = os.path.splitext(input_image_filename)[0]
+    try:
+        thumbnails = generate_thumbnails(input_image_path, [1024, 512, 256, 128])
+        for size, thumbnail in thumbnails.items():
+            thumbnail_path = os.path.join(output_dir_path, f"{base_name}_{size}.png")
+            Image.fromarray(thumbnail).save(thumbnail_path)
+            print(f"Miniatura {size} {thumbnail.shape} salva em '{thumbnail_path}'.")
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de imagem não encontrado em '{input_image_path}'.")
+    except UnidentifiedImageError:
+        print(f"Erro: Não foi possível identificar o arquivo de imagem '{input_image_path}'.")
+    except ValueError as ve:
+        print(f"Erro de valor: {ve}")
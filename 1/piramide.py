@@ -0,0 +1,168 @@
+import os
+import weakref
+import numpy as np
+from PIL import Image
+from typing import Dict, List, Tuple
+
+from reducao_bilinear import bilinear_interpolation
+from reducao_vizinho import downsample_nearest_neighbor
+
+# Cache de pirâmides por imagem de entrada: id(imagem) -> (weakref da imagem, {(níveis, método): pirâmide})
+_pyramid_cache: Dict[int, Tuple[weakref.ref, Dict[Tuple[int, str], 'ImagePyramid']]] = {}
+
+# --- Pirâmide de Imagens ---
+
+class ImagePyramid:
+    """
+    Pirâmide multirresolução com todos os níveis em um único buffer contíguo.
+
+    O nível 0 é a imagem original e cada nível seguinte tem metade da altura e da
+    largura do anterior. Os níveis são visões de fatias consecutivas de `buffer`,
+    então acessar qualquer nível é O(1) e não copia dados. Depois de preenchida
+    por `build_pyramid` a pirâmide é somente leitura, porque pode estar em cache
+    e ser compartilhada; use `.copy()` em um nível para modificá-lo.
+
+    Atributos:
+        buffer: Array NumPy 1D com os pixels de todos os níveis, em sequência.
+        shapes: Shape de cada nível.
+        offsets: Posição inicial de cada nível em `buffer`.
+        method: Método de redução usado entre níveis.
+    """
+
+    def __init__(self, shapes: List[Tuple[int, ...]], dtype: np.dtype, method: str):
+        sizes = [int(np.prod(shape)) for shape in shapes]
+        self.shapes = shapes
+        self.offsets = [0] + list(np.cumsum(sizes)[:-1])
+        self.buffer = np.empty(sum(sizes), dtype=dtype)
+        self.method = method
+        self._levels = [self.buffer[offset:offset + size].reshape(shape)
+                        for offset, size, shape in zip(self.offsets, sizes, shapes)]
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __getitem__(self, level: int) -> np.ndarray:
+        return self._levels[level]
+
+    def level(self, level: int) -> np.ndarray:
+        """
+        Retorna o nível pedido (0 = resolução original) como visão do buffer.
+
+        Args:
+            level: Índice do nível.
+
+        Returns:
+            Array NumPy (visão somente leitura) com a imagem do nível.
+        """
+        return self._levels[level]
+
+    def freeze(self) -> None:
+        """Torna o buffer e as visões dos níveis somente leitura."""
+        self.buffer.flags.writeable = False
+        for level in self._levels:
+            level.flags.writeable = False
+
+def reduce_by_half(pixels: np.ndarray, method: str) -> np.ndarray:
+    """
+    Reduz uma imagem pela metade com o método de redução pedido.
+
+    Args:
+        pixels: Array NumPy (H, W) ou (H, W, C).
+        method: 'area' (média de blocos 2x2), 'nearest' ou 'bilinear'.
+
+    Returns:
+        Array NumPy com shape (H // 2, W // 2[, C]).
+    """
+    if method == 'area':
+        return downsample_nearest_neighbor(pixels, 2, mode='area')
+    if method == 'nearest':
+        height, width = pixels.shape[:2]
+        return downsample_nearest_neighbor(pixels, 2)[:height // 2, :width // 2]
+    if method == 'bilinear':
+        height, width = pixels.shape[:2]
+        return bilinear_interpolation(pixels, (width // 2, height // 2))
+    raise ValueError(f"Método de redução não suportado: '{method}'. Use 'area', 'nearest' ou 'bilinear'.")
+
+def build_pyramid(image: np.ndarray, levels: int, method: str = 'area', use_cache: bool = True) -> ImagePyramid:
+    """
+    Constrói uma pirâmide de imagens (1, 1/2, 1/4, ...) derivando cada nível do anterior.
+
+    Cada nível é calculado a partir do nível imediatamente anterior, e não da
+    imagem em resolução total, e é escrito direto no buffer único da pirâmide.
+    As pirâmides ficam em cache por imagem de entrada (pela identidade do array),
+    então pedir a mesma pirâmide de novo não recalcula nada. A entrada do cache
+    é descartada quando a imagem deixa de existir.
+
+    Nota: o cache assume que a imagem não é modificada depois de construída a
+    pirâmide; se ela for alterada in place, use use_cache=False ou clear_pyramid_cache().
+
+    Args:
+        image: Array NumPy (H, W) ou (H, W, C).
+        levels: Número total de níveis, incluindo o original (>= 1).
+        method: Redução entre níveis: 'area' (padrão), 'nearest' ou 'bilinear'.
+        use_cache: Se False, ignora e não alimenta o cache.
+
+    Returns:
+        A ImagePyramid correspondente, somente leitura.
+
+    Raises:
+        ValueError: Se os níveis forem inválidos ou a imagem for pequena demais.
+    """
+    if levels < 1:
+        raise ValueError("A pirâmide deve ter pelo menos 1 nível.")
+    if image.ndim not in (2, 3):
+        raise ValueError(f"A imagem deve ser 2D ou 3D, recebido shape {image.shape}.")
+
+    key = (levels, method)
+    if use_cache:
+        cached = _pyramid_cache.get(id(image))
+        if cached is not None and cached[0]() is image and key in cached[1]:
+            return cached[1][key]
+
+    height, width = image.shape[:2]
+    if (height >> (levels - 1)) == 0 or (width >> (levels - 1)) == 0:
+        raise ValueError(f"Imagem {height}x{width} pequena demais para {levels} níveis.")
+    shapes = [(height >> k, width >> k) + image.shape[2:] for k in range(levels)]
+
+    pyramid = ImagePyramid(shapes, image.dtype, method)
+    pyramid[0][...] = image
+    for k in range(1, levels):
+        pyramid[k][...] = reduce_by_half(pyramid[k - 1], method)
+    pyramid.freeze()
+
+    if use_cache:
+        cached = _pyramid_cache.get(id(image))
+        if cached is None or cached[0]() is not image:
+            image_id = id(image)
+            cached = (weakref.ref(image), {})
+            _pyramid_cache[image_id] = cached
+            weakref.finalize(image, _pyramid_cache.pop, image_id, None)
+        cached[1][key] = pyramid
+    return pyramid
+
+def clear_pyramid_cache() -> None:
+    """Descarta todas as pirâmides em cache."""
+    _pyramid_cache.clear()
+
+# --- Bloco de Execução Principal ---
+
+if __name__ == '__main__':
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    input_image_filename = "brat.jpeg"
+    input_image_path = os.path.join(script_dir, input_image_filename)
+
+    output_dir_path = os.path.join(script_dir, "resultados_piramide")
+    os.makedirs(output_dir_path, exist_ok=True)
+
+    try:
+        with Image.open(input_image_path) as pil_image:
+            gray_numpy = np.array(pil_image.convert('L'))
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de imagem não encontrado em '{input_image_path}'.")
+    else:
+        base_name = os.path.splitext(input_image_filename)[0]
+        pyramid = build_pyramid(gray_numpy, levels=4, method='area')
+        for k in range(1, len(pyramid)):
+            level_path = os.path.join(output_dir_path, f"{base_name}_nivel_{k}.png")
+            Image.fromarray(pyramid.level(k)).save(level_path)
+            print(f"Nível {k} {pyramid.level(k).shape} salvo em '{level_path}'.")
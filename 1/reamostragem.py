@@ -0,0 +1,595 @@
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+# Número máximo de planos mantidos no cache LRU (um por geometria distinta)
+RESAMPLE_PLAN_CACHE_SIZE = 32
+
+# Bits de fração dos pesos em ponto fixo: cada passagem multiplica por no máximo 2**8,
+# então uint8 -> uint16 (linhas) -> uint32 (colunas) nunca transborda
+FIXED_POINT_BITS = 8
+
+# --- Tabelas de Amostragem por Eixo ---
+
+def compute_nearest_axis_indices(source_length: int, target_length: int) -> np.ndarray:
+    """
+    Pré-calcula os índices de origem do vizinho mais próximo para um eixo da imagem.
+
+    Cada pixel de destino usa o pixel de origem do canto superior esquerdo da
+    área que cobre, `floor(dst * source_length / target_length)`, calculado em
+    aritmética inteira. É a convenção de `downsample_nearest_neighbor` (passo
+    `[::fator]`) em reduções por fator inteiro, e para ampliações por fator
+    inteiro equivale a `dst // fator`.
+
+    Args:
+        source_length: Número de pixels no eixo da imagem de origem.
+        target_length: Número de pixels no eixo da imagem de destino.
+
+    Returns:
+        Array NumPy (target_length,) com os índices de origem.
+    """
+    return np.arange(target_length, dtype=np.intp) * source_length // target_length
+
+def compute_bilinear_axis_weights(
+    source_length: int, target_length: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pré-calcula a tabela de amostragem bilinear para um eixo da imagem.
+
+    O centro de cada amostra de destino é mapeado para a origem pela convenção
+    de meio pixel, `src = (dst + 0.5) * source_length / target_length - 0.5`,
+    e limitado ao intervalo válido, de modo que as bordas replicam os pixels
+    da extremidade.
+
+    Args:
+        source_length: Número de pixels no eixo da imagem de origem.
+        target_length: Número de pixels no eixo da imagem de destino.
+
+    Returns:
+        Tupla (lower_indices, upper_indices, upper_weights):
+        - lower_indices: Índice de origem imediatamente antes de cada amostra.
+        - upper_indices: Índice de origem imediatamente depois de cada amostra.
+        - upper_weights: Peso do vizinho superior (float32); o inferior recebe
+          1 - upper_weights.
+    """
+    scale = source_length / target_length
+    positions = (np.arange(target_length, dtype=np.float64) + 0.5) * scale - 0.5
+    positions = np.clip(positions, 0, source_length - 1)
+
+    lower_indices = np.floor(positions).astype(np.intp)
+    upper_indices = np.minimum(lower_indices + 1, source_length - 1)
+    upper_weights = (positions - lower_indices).astype(np.float32)
+    return lower_indices, upper_indices, upper_weights
+
+def compute_area_coverage_weights(
+    source_length: int, target_length: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pré-calcula os pesos de média por área (box) para um eixo da imagem.
+
+    Cada pixel de destino i cobre o intervalo de origem [i * s, (i + 1) * s),
+    com s = source_length / target_length. O peso de cada pixel de origem é a
+    fração desse intervalo que ele cobre, então os pesos de cada pixel de destino
+    somam 1 e razões fracionárias são tratadas de forma exata.
+
+    Args:
+        source_length: Número de pixels no eixo da imagem de origem.
+        target_length: Número de pixels no eixo da imagem reduzida.
+
+    Returns:
+        Tupla (indices, weights), ambos com shape (target_length, taps):
+        - indices: Índices de origem que contribuem para cada pixel de destino.
+        - weights: Peso de cobertura de cada um desses pixels (float32). Taps
+          não usados apontam para um índice válido com peso 0.
+    """
+    scale = source_length / target_length
+    starts = np.arange(target_length, dtype=np.float64) * scale
+    ends = starts + scale
+    taps = int(np.ceil(scale)) + 1
+
+    indices = np.floor(starts).astype(np.intp)[:, None] + np.arange(taps)
+    overlap = np.minimum(indices + 1, ends[:, None]) - np.maximum(indices, starts[:, None])
+    weights = (np.clip(overlap, 0, None) / scale).astype(np.float32)
+    return np.minimum(indices, source_length - 1), weights
+
+def bicubic_kernel(x: np.ndarray, a: float = -0.5) -> np.ndarray:
+    """
+    Núcleo cúbico de Keys (suporte 2), o mesmo usado pelo filtro BICUBIC do Pillow.
+
+    Args:
+        x: Distâncias ao centro da amostra, em pixels.
+        a: Parâmetro do núcleo (-0.5 por padrão).
+
+    Returns:
+        Array NumPy com o peso de cada distância.
+    """
+    x = np.abs(x)
+    near = ((a + 2) * x - (a + 3)) * x * x + 1
+    far = ((a * x - 5 * a) * x + 8 * a) * x - 4 * a
+    return np.where(x < 1, near, np.where(x < 2, far, 0.0))
+
+def lanczos3_kernel(x: np.ndarray) -> np.ndarray:
+    """
+    Núcleo de Lanczos com 3 lóbulos (suporte 3): sinc(x) * sinc(x / 3).
+
+    Args:
+        x: Distâncias ao centro da amostra, em pixels.
+
+    Returns:
+        Array NumPy com o peso de cada distância.
+    """
+    return np.where(np.abs(x) < 3, np.sinc(x) * np.sinc(x / 3), 0.0)
+
+# Núcleos de convolução separáveis: método -> (função, suporte em pixels)
+CONVOLUTION_KERNELS = {
+    'bicubic': (bicubic_kernel, 2.0),
+    'lanczos3': (lanczos3_kernel, 3.0),
+}
+
+def compute_kernel_axis_weights(source_length: int, target_length: int, method: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pré-calcula a matriz de pesos em banda de um núcleo de convolução para um eixo.
+
+    Cada pixel de destino combina apenas os `taps` pixels de origem dentro do
+    suporte do núcleo, então o custo é linear no tamanho da saída. Em reduções o
+    suporte é alargado pelo fator de escala (antialiasing). Taps que caem fora da
+    imagem recebem peso 0 e os pesos de cada linha são normalizados para somar 1.
+
+    Args:
+        source_length: Número de pixels no eixo da imagem de origem.
+        target_length: Número de pixels no eixo da imagem de destino.
+        method: Chave de CONVOLUTION_KERNELS ('bicubic' ou 'lanczos3').
+
+    Returns:
+        Tupla (indices, weights) com shape (target_length, taps).
+    """
+    kernel, kernel_support = CONVOLUTION_KERNELS[method]
+    scale = source_length / target_length
+    filter_scale = max(scale, 1.0)
+    support = kernel_support * filter_scale
+    taps = 2 * int(np.ceil(support)) + 1
+
+    centers = (np.arange(target_length, dtype=np.float64) + 0.5) * scale
+    indices = np.floor(centers - support + 0.5).astype(np.intp)[:, None] + np.arange(taps)
+    weights = kernel((indices + 0.5 - centers[:, None]) / filter_scale)
+    weights[(indices < 0) | (indices >= source_length)] = 0.0
+    weights /= weights.sum(axis=1, keepdims=True)
+    return np.clip(indices, 0, source_length - 1), weights.astype(np.float32)
+
+def compute_axis_taps(source_length: int, target_length: int, method: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Retorna a tabela de um eixo no formato genérico (indices, weights) por método.
+
+    Todos os métodos passam a ser descritos por matrizes (target_length, taps) de
+    índices de origem e pesos, que podem ser aplicadas com `apply_axis_weights`
+    a qualquer faixa da imagem.
+
+    Args:
+        source_length: Número de pixels no eixo da imagem de origem.
+        target_length: Número de pixels no eixo da imagem de destino.
+        method: 'nearest' (1 tap), 'bilinear' (2 taps), 'area', 'bicubic' ou 'lanczos3'.
+
+    Returns:
+        Tupla (indices, weights) com shape (target_length, taps).
+    """
+    if method == 'nearest':
+        indices = compute_nearest_axis_indices(source_length, target_length)[:, np.newaxis]
+        return indices, np.ones(indices.shape, dtype=np.float32)
+    if method == 'bilinear':
+        lower, upper, upper_weights = compute_bilinear_axis_weights(source_length, target_length)
+        return np.stack((lower, upper), axis=1), np.stack((1 - upper_weights, upper_weights), axis=1)
+    if method == 'area':
+        return compute_area_coverage_weights(source_length, target_length)
+    if method in CONVOLUTION_KERNELS:
+        return compute_kernel_axis_weights(source_length, target_length, method)
+    raise ValueError(f"Método de reamostragem não suportado: '{method}'.")
+
+def apply_axis_weights(pixels: np.ndarray, indices: np.ndarray, weights: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Reamostra um eixo da imagem como soma ponderada de fatias de origem.
+
+    Com dois taps (pesos somando 1, como no bilinear) a soma é calculada como
+    `a + (b - a) * w`, na mesma ordem de operações float32 do caminho bilinear
+    de ResamplePlan, para que a redução em faixas arredonde exatamente igual.
+
+    Args:
+        pixels: Array NumPy da imagem.
+        indices: Índices de origem, com shape (target_length, taps).
+        weights: Pesos correspondentes a `indices` (float32).
+        axis: Eixo de `pixels` a ser reamostrado (0 para linhas, 1 para colunas).
+
+    Returns:
+        Array NumPy float32 com o eixo `axis` redimensionado para target_length.
+    """
+    # Formato dos pesos de cada tap para fazer broadcast sobre os eixos após `axis`
+    broadcast_shape = (-1,) + (1,) * (pixels.ndim - axis - 1)
+    if indices.shape[1] == 2:
+        result = np.take(pixels, indices[:, 0], axis=axis).astype(np.float32)
+        difference = np.take(pixels, indices[:, 1], axis=axis).astype(np.float32)
+        difference -= result
+        difference *= weights[:, 1].reshape(broadcast_shape)
+        result += difference
+        return result
+    result = None
+    for tap in range(indices.shape[1]):
+        contribution = np.take(pixels, indices[:, tap], axis=axis).astype(np.float32)
+        contribution *= weights[:, tap].reshape(broadcast_shape)
+        result = contribution if result is None else result + contribution
+    return result
+
+def quantize_axis_weights(weights: np.ndarray, bits: int = FIXED_POINT_BITS) -> np.ndarray:
+    """
+    Converte pesos float de um eixo em inteiros de ponto fixo que somam exatamente 2**bits.
+
+    Os pesos são truncados para múltiplos de 2**-bits e as unidades que faltam em
+    cada linha vão para os taps com maior resto (método do maior resto). Assim os
+    pesos continuam não negativos e uma região constante continua constante.
+
+    Args:
+        weights: Pesos (target_length, taps), não negativos, com linhas somando 1.
+        bits: Número de bits da parte fracionária.
+
+    Returns:
+        Array NumPy uint16 com os pesos quantizados.
+
+    Raises:
+        ValueError: Se houver pesos negativos (núcleos como bicúbico e Lanczos).
+    """
+    if np.any(weights < 0):
+        raise ValueError("O caminho em ponto fixo só aceita pesos não negativos (bilinear e área).")
+    scaled = weights.astype(np.float64) * (1 << bits)
+    quantized = np.floor(scaled).astype(np.int64)
+    missing = (1 << bits) - quantized.sum(axis=1, keepdims=True)
+    # Posição de cada tap na ordem decrescente de resto; os `missing` primeiros ganham +1
+    remainder_rank = np.argsort(np.argsort(quantized - scaled, axis=1, kind='stable'), axis=1)
+    quantized += remainder_rank < missing
+    return quantized.astype(np.uint16)
+
+def apply_axis_weights_fixed(pixels: np.ndarray, indices: np.ndarray, quantized_weights: np.ndarray,
+                             axis: int, accumulator_dtype: type) -> np.ndarray:
+    """
+    Versão inteira de `apply_axis_weights`: soma ponderada com pesos de ponto fixo.
+
+    O resultado fica escalado por 2**FIXED_POINT_BITS em relação à entrada; nenhum
+    valor passa por ponto flutuante.
+
+    Args:
+        pixels: Array NumPy inteiro da imagem.
+        indices: Índices de origem, com shape (target_length, taps).
+        quantized_weights: Pesos de `quantize_axis_weights`.
+        axis: Eixo de `pixels` a ser reamostrado.
+        accumulator_dtype: Tipo inteiro do acumulador (ex.: np.uint16, np.uint32).
+
+    Returns:
+        Array NumPy do tipo `accumulator_dtype` com o eixo `axis` redimensionado.
+    """
+    broadcast_shape = (-1,) + (1,) * (pixels.ndim - axis - 1)
+    result = None
+    for tap in range(indices.shape[1]):
+        contribution = np.take(pixels, indices[:, tap], axis=axis).astype(accumulator_dtype)
+        contribution *= quantized_weights[:, tap].reshape(broadcast_shape).astype(accumulator_dtype)
+        result = contribution if result is None else result + contribution
+    return result
+
+# --- Plano de Reamostragem ---
+
+class ResamplePlan:
+    """
+    Plano de reamostragem pré-calculado para uma geometria fixa.
+
+    Guarda, para um par (forma de origem, forma de destino, método), as tabelas
+    de índices e pesos de cada eixo. Redimensionar várias imagens com a mesma
+    geometria reutiliza essas tabelas, sem nenhum cálculo de coordenadas por chamada.
+
+    O buffer de saída (`output`) e os buffers intermediários só são alocados, e
+    mantidos no plano, na primeira chamada de `execute` sem `out`. Quando o
+    destino é informado, os intermediários são temporários da chamada, então os
+    planos no cache guardam apenas as tabelas.
+
+    Métodos suportados: 'nearest', 'bilinear', 'area', 'bicubic' e 'lanczos3'.
+    A saída de 'nearest' mantém o dtype da entrada; a dos demais é sempre uint8.
+
+    Com batched=True a origem é uma pilha (N, H, W) ou (N, H, W, C): o mesmo
+    conjunto de tabelas é aplicado a todas as imagens em uma única passagem.
+
+    Com fixed_point=True ('bilinear' e 'area', entrada uint8) os pesos são
+    quantizados em FIXED_POINT_BITS bits e todo o cálculo é inteiro
+    (uint8 -> uint16 -> uint32 -> uint8), com no máximo um nível de cinza de
+    diferença em relação ao caminho float32 e metade do tráfego de memória.
+
+    Os buffers são compartilhados entre as chamadas do mesmo plano, por isso
+    `execute` é protegido por um lock.
+    """
+
+    def __init__(self, source_shape: Tuple[int, ...], dtype: np.dtype,
+                 target_hw: Tuple[int, int], method: str, batched: bool = False,
+                 fixed_point: bool = False):
+        # Eixo das linhas: 0 para uma imagem, 1 para uma pilha (N, H, W[, C])
+        self.row_axis = 1 if batched else 0
+        if len(source_shape) - self.row_axis not in (2, 3):
+            expected = "3D ou 4D (N, H, W[, C])" if batched else "2D ou 3D"
+            raise ValueError(f"A imagem deve ser {expected}, recebido shape {source_shape}.")
+        target_height, target_width = target_hw
+        if target_height <= 0 or target_width <= 0:
+            raise ValueError("As dimensões de destino devem ser positivas.")
+        if method not in _PLAN_BUILDERS:
+            raise ValueError(f"Método de reamostragem não suportado: '{method}'. "
+                             f"Use um de {sorted(_PLAN_BUILDERS)}.")
+
+        self.source_shape = tuple(source_shape)
+        self.dtype = np.dtype(dtype)
+        self.batched = batched
+        self.leading_shape = self.source_shape[:self.row_axis]
+        self.channel_shape = self.source_shape[self.row_axis + 2:]
+        self.source_hw = self.source_shape[self.row_axis:self.row_axis + 2]
+        self.target_shape = self.leading_shape + (target_height, target_width) + self.channel_shape
+        self.method = method
+        self.fixed_point = fixed_point
+        self.lock = threading.Lock()
+        # 'nearest' mantém o dtype da entrada; os demais métodos produzem uint8
+        self.output_dtype = self.dtype if method == 'nearest' else np.dtype(np.uint8)
+        self._output: Optional[np.ndarray] = None
+        self._work_buffers: Dict[str, np.ndarray] = {}
+        if fixed_point:
+            if method not in ('bilinear', 'area'):
+                raise ValueError("O caminho em ponto fixo só está disponível para 'bilinear' e 'area'.")
+            if self.dtype != np.uint8:
+                raise ValueError("O caminho em ponto fixo exige imagens uint8.")
+            self._build_fixed_point()
+        else:
+            _PLAN_BUILDERS[method](self)
+
+    def _rows_shape(self) -> Tuple[int, ...]:
+        # Shape após a passagem das linhas: linhas de destino, colunas de origem
+        return self.leading_shape + (self.target_shape[self.row_axis], self.source_hw[1]) + self.channel_shape
+
+    def _build_nearest(self) -> None:
+        source_height, source_width = self.source_hw
+        target_height, target_width = self.target_shape[self.row_axis:self.row_axis + 2]
+        self.row_indices = compute_nearest_axis_indices(source_height, target_height)
+        self.col_indices = compute_nearest_axis_indices(source_width, target_width)
+        # Ampliação por fatores inteiros: cada pixel vira um bloco, preenchido por cópias com passo
+        if target_height % source_height == 0 and target_width % source_width == 0:
+            self.integer_scale = (target_height // source_height, target_width // source_width)
+        else:
+            self.integer_scale = None
+
+    def _build_bilinear(self) -> None:
+        source_height, source_width = self.source_hw
+        target_height, target_width = self.target_shape[self.row_axis:self.row_axis + 2]
+        extra_axes = len(self.channel_shape)
+
+        self.rows_top, self.rows_bottom, row_weights = compute_bilinear_axis_weights(source_height, target_height)
+        self.cols_left, self.cols_right, col_weights = compute_bilinear_axis_weights(source_width, target_width)
+        # Pesos já no formato que faz broadcast sobre os eixos restantes
+        self.row_weights = row_weights.reshape((-1,) + (1,) * (extra_axes + 1))
+        self.col_weights = col_weights.reshape((-1,) + (1,) * extra_axes)
+
+    def _build_taps(self) -> None:
+        # Métodos descritos por matrizes de pesos em banda (área e núcleos de convolução)
+        source_height, source_width = self.source_hw
+        target_height, target_width = self.target_shape[self.row_axis:self.row_axis + 2]
+        self.row_indices, self.row_weights = compute_axis_taps(source_height, target_height, self.method)
+        self.col_indices, self.col_weights = compute_axis_taps(source_width, target_width, self.method)
+
+    def _build_fixed_point(self) -> None:
+        source_height, source_width = self.source_hw
+        target_height, target_width = self.target_shape[self.row_axis:self.row_axis + 2]
+        self.row_indices, row_weights = compute_axis_taps(source_height, target_height, self.method)
+        self.col_indices, col_weights = compute_axis_taps(source_width, target_width, self.method)
+        self.row_weights = quantize_axis_weights(row_weights)
+        self.col_weights = quantize_axis_weights(col_weights)
+
+    @property
+    def output(self) -> np.ndarray:
+        """Buffer de saída reutilizável do plano, alocado no primeiro uso."""
+        if self._output is None:
+            self._output = np.empty(self.target_shape, dtype=self.output_dtype)
+        return self._output
+
+    def _work_buffer(self, name: str, shape: Tuple[int, ...], dtype: type, keep: bool) -> np.ndarray:
+        # Buffer intermediário: guardado no plano só no modo de reutilização (keep=True)
+        if not keep:
+            return np.empty(shape, dtype=dtype)
+        buffer = self._work_buffers.get(name)
+        if buffer is None:
+            buffer = self._work_buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    def execute(self, pixels: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Aplica o plano a uma imagem (ou pilha) com a geometria do plano.
+
+        Args:
+            pixels: Array NumPy com shape e dtype iguais aos do plano.
+            out: Array de destino opcional. Se None, o resultado é escrito no
+                 buffer de saída do plano (`self.output`), que é sobrescrito na
+                 próxima chamada; nesse modo os buffers intermediários também
+                 ficam guardados no plano para as próximas chamadas.
+
+        Returns:
+            O array de destino com a imagem reamostrada.
+        """
+        if pixels.shape != self.source_shape or pixels.dtype != self.dtype:
+            raise ValueError(f"Imagem {pixels.shape}/{pixels.dtype} incompatível com o plano "
+                             f"{self.source_shape}/{self.dtype}.")
+        keep_buffers = out is None
+        if keep_buffers:
+            out = self.output
+        row_axis, col_axis = self.row_axis, self.row_axis + 1
+
+        with self.lock:
+            if self.method == 'nearest':
+                if self.integer_scale is not None and out.flags.c_contiguous:
+                    self._fill_integer_blocks(pixels, out)
+                    return out
+                rows = self._work_buffer('rows', self._rows_shape(), self.dtype, keep_buffers)
+                np.take(pixels, self.row_indices, axis=row_axis, out=rows, mode='clip')
+                np.take(rows, self.col_indices, axis=col_axis, out=out, mode='clip')
+                return out
+
+            if self.fixed_point:
+                # Linhas: uint8 * pesos de 8 bits cabe em uint16; colunas: uint16 * 8 bits cabe em uint32
+                rows = apply_axis_weights_fixed(pixels, self.row_indices, self.row_weights,
+                                                axis=row_axis, accumulator_dtype=np.uint16)
+                resampled = apply_axis_weights_fixed(rows, self.col_indices, self.col_weights,
+                                                     axis=col_axis, accumulator_dtype=np.uint32)
+                resampled += 1 << (2 * FIXED_POINT_BITS - 1)
+                resampled >>= 2 * FIXED_POINT_BITS
+                np.copyto(out, resampled, casting='unsafe')
+                return out
+
+            if self.method != 'bilinear':
+                resampled = apply_axis_weights(pixels, self.row_indices, self.row_weights, axis=row_axis)
+                resampled = apply_axis_weights(resampled, self.col_indices, self.col_weights, axis=col_axis)
+                np.rint(resampled, out=resampled)
+                np.clip(resampled, 0, 255, out=resampled)
+                np.copyto(out, resampled, casting='unsafe')
+                return out
+
+            # Passo 1: interpolação entre linhas da origem
+            rows_shape = self._rows_shape()
+            top = self._work_buffer('top', rows_shape, self.dtype, keep_buffers)
+            bottom = self._work_buffer('bottom', rows_shape, self.dtype, keep_buffers)
+            rows = self._work_buffer('rows', rows_shape, np.float32, keep_buffers)
+            np.take(pixels, self.rows_top, axis=row_axis, out=top, mode='clip')
+            np.take(pixels, self.rows_bottom, axis=row_axis, out=bottom, mode='clip')
+            np.subtract(bottom, top, out=rows, dtype=np.float32)
+            rows *= self.row_weights
+            rows += top
+
+            # Passo 2: interpolação entre colunas do resultado intermediário
+            left = self._work_buffer('left', self.target_shape, np.float32, keep_buffers)
+            right = self._work_buffer('right', self.target_shape, np.float32, keep_buffers)
+            np.take(rows, self.cols_left, axis=col_axis, out=left, mode='clip')
+            np.take(rows, self.cols_right, axis=col_axis, out=right, mode='clip')
+            right -= left
+            right *= self.col_weights
+            right += left
+
+            np.rint(right, out=right)
+            np.clip(right, 0, 255, out=right)
+            np.copyto(out, right, casting='unsafe')
+            return out
+
+    def execute_rows(self, pixels: np.ndarray, out: np.ndarray, row_start: int, row_end: int) -> None:
+        """
+        Calcula apenas as linhas de destino [row_start, row_end) e as escreve em `out`.
+
+        Diferente de `execute`, não usa os buffers compartilhados do plano (cada
+        chamada aloca temporários do tamanho da faixa) e não toma o lock, então
+        várias faixas do mesmo plano podem ser calculadas ao mesmo tempo em
+        threads diferentes. As tabelas do plano são apenas lidas.
+
+        Disponível para imagens únicas (não batched) com os métodos de pesos
+        ('bilinear', 'area', 'bicubic', 'lanczos3', e o caminho em ponto fixo).
+
+        Args:
+            pixels: Array NumPy com shape e dtype iguais aos do plano.
+            out: Array de destino com shape `target_shape` (compartilhado entre as faixas).
+            row_start: Primeira linha de destino da faixa.
+            row_end: Linha de destino final da faixa (exclusiva).
+        """
+        if self.row_axis != 0 or self.method == 'nearest':
+            raise ValueError("Execução por faixas só está disponível para imagens únicas "
+                             "com métodos de pesos.")
+        band_out = out[row_start:row_end]
+
+        if self.fixed_point:
+            rows = apply_axis_weights_fixed(pixels, self.row_indices[row_start:row_end],
+                                            self.row_weights[row_start:row_end],
+                                            axis=0, accumulator_dtype=np.uint16)
+            resampled = apply_axis_weights_fixed(rows, self.col_indices, self.col_weights,
+                                                 axis=1, accumulator_dtype=np.uint32)
+            resampled += 1 << (2 * FIXED_POINT_BITS - 1)
+            resampled >>= 2 * FIXED_POINT_BITS
+            np.copyto(band_out, resampled, casting='unsafe')
+            return
+
+        if self.method != 'bilinear':
+            resampled = apply_axis_weights(pixels, self.row_indices[row_start:row_end],
+                                           self.row_weights[row_start:row_end], axis=0)
+            resampled = apply_axis_weights(resampled, self.col_indices, self.col_weights, axis=1)
+        else:
+            top = np.take(pixels, self.rows_top[row_start:row_end], axis=0)
+            rows = np.subtract(np.take(pixels, self.rows_bottom[row_start:row_end], axis=0), top,
+                               dtype=np.float32)
+            rows *= self.row_weights[row_start:row_end]
+            rows += top
+            resampled = np.take(rows, self.cols_left, axis=1)
+            right = np.take(rows, self.cols_right, axis=1)
+            right -= resampled
+            right *= self.col_weights
+            resampled += right
+        np.rint(resampled, out=resampled)
+        np.clip(resampled, 0, 255, out=resampled)
+        np.copyto(band_out, resampled, casting='unsafe')
+
+    def _fill_integer_blocks(self, pixels: np.ndarray, out: np.ndarray) -> None:
+        # Vizinho mais próximo com fatores inteiros: preenche a primeira linha de cada
+        # bloco com uma cópia por fase de coluna e replica essa linha para as demais.
+        # É bem mais rápido que indexação por coluna (np.take no eixo das colunas).
+        source_height, source_width = self.source_hw
+        scale_rows, scale_cols = self.integer_scale
+        lead, channels = self.leading_shape, self.channel_shape
+        blocks = out.reshape(lead + (source_height, scale_rows, source_width * scale_cols) + channels)
+        row_phase_index = (slice(None),) * (len(lead) + 1)
+        first_rows = blocks[row_phase_index + (0,)].reshape(
+            lead + (source_height, source_width, scale_cols) + channels)
+        col_phase_index = (slice(None),) * (len(lead) + 2)
+        for col_phase in range(scale_cols):
+            first_rows[col_phase_index + (col_phase,)] = pixels
+        for row_phase in range(1, scale_rows):
+            blocks[row_phase_index + (row_phase,)] = blocks[row_phase_index + (0,)]
+
+_PLAN_BUILDERS: Dict[str, Callable[[ResamplePlan], None]] = {
+    'nearest': ResamplePlan._build_nearest,
+    'bilinear': ResamplePlan._build_bilinear,
+    'area': ResamplePlan._build_taps,
+    'bicubic': ResamplePlan._build_taps,
+    'lanczos3': ResamplePlan._build_taps,
+}
+
+# --- Cache de Planos ---
+
+@lru_cache(maxsize=RESAMPLE_PLAN_CACHE_SIZE)
+def _cached_resample_plan(source_shape: Tuple[int, ...], dtype_str: str, target_hw: Tuple[int, int],
+                          method: str, batched: bool, fixed_point: bool) -> ResamplePlan:
+    return ResamplePlan(source_shape, np.dtype(dtype_str), target_hw, method, batched, fixed_point)
+
+def get_resample_plan(pixels: np.ndarray, target_hw: Tuple[int, int], method: str,
+                      batched: bool = False, fixed_point: bool = False) -> ResamplePlan:
+    """
+    Retorna o plano de reamostragem para a geometria de `pixels`, criando-o se necessário.
+
+    Os planos ficam em um cache LRU limitado a RESAMPLE_PLAN_CACHE_SIZE entradas,
+    indexado por (shape de origem, dtype, (altura, largura) de destino, método,
+    batched, fixed_point).
+
+    Args:
+        pixels: Array NumPy da imagem de origem (só shape e dtype são usados).
+        target_hw: Tupla (altura, largura) de destino.
+        method: Um dos métodos suportados por ResamplePlan.
+        batched: Se True, `pixels` é uma pilha (N, H, W[, C]).
+        fixed_point: Se True, usa o caminho inteiro de ponto fixo.
+
+    Returns:
+        O ResamplePlan correspondente.
+    """
+    target_hw = (int(target_hw[0]), int(target_hw[1]))
+    return _cached_resample_plan(tuple(pixels.shape), pixels.dtype.str, target_hw, method, batched, fixed_point)
+
+def resample_plan_cache_info():
+    """
+    Retorna as estatísticas do cache de planos.
+
+    Returns:
+        Named tuple (hits, misses, maxsize, currsize) de `functools.lru_cache`.
+    """
+    return _cached_resample_plan.cache_info()
+
+def clear_resample_plan_cache() -> None:
+    """Esvazia o cache de planos e zera os contadores de acertos/faltas."""
+    _cached_resample_plan.cache_clear()
@@ -0,0 +1,224 @@
+import os
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+from typing import Optional, Tuple, Union
+
+from reamostragem import apply_axis_weights, compute_axis_taps
+
+# Orçamento de memória padrão para as faixas em processamento (64 MiB)
+DEFAULT_MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+
+# Modos PIL de TIFF sem compressão que podem ser mapeados diretamente: modo -> (dtype, canais)
+_TIFF_MEMMAP_MODES = {'L': (np.uint8, ()), 'RGB': (np.uint8, (3,)), 'RGBA': (np.uint8, (4,))}
+
+# --- Abertura de Fontes Mapeadas em Memória ---
+
+def open_image_memmap(file_path: str,
+                      shape: Optional[Tuple[int, ...]] = None,
+                      dtype: type = np.uint8) -> np.ndarray:
+    """
+    Abre uma imagem em disco como array mapeado em memória (somente leitura).
+
+    Nada é lido até que as linhas sejam acessadas, então imagens maiores que a
+    memória podem ser percorridas em faixas.
+
+    Formatos suportados:
+    - .npy: via `np.load(..., mmap_mode='r')`.
+    - .raw / .bin: pixels crus em ordem de linhas; `shape` (H, W) ou (H, W, C)
+      e `dtype` são obrigatórios.
+    - .tif / .tiff: apenas TIFF sem compressão, em modo L, RGB ou RGBA, com as
+      faixas gravadas de forma contígua (o padrão do Pillow).
+
+    Args:
+        file_path: Caminho para o arquivo.
+        shape: Shape da imagem (apenas para arquivos crus).
+        dtype: Tipo dos pixels (apenas para arquivos crus).
+
+    Returns:
+        Array NumPy (np.memmap) somente leitura com shape (H, W) ou (H, W, C).
+
+    Raises:
+        ValueError: Se o formato não for suportado ou não puder ser mapeado.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+
+    if extension == '.npy':
+        return np.load(file_path, mmap_mode='r')
+
+    if extension in ('.raw', '.bin'):
+        if shape is None:
+            raise ValueError("Arquivos crus exigem o parâmetro 'shape'.")
+        return np.memmap(file_path, dtype=dtype, mode='r', shape=tuple(shape))
+
+    if extension in ('.tif', '.tiff'):
+        try:
+            with Image.open(file_path) as image:
+                mode, tiles, (width, height) = image.mode, list(image.tile), image.size
+        except UnidentifiedImageError as e:
+            raise ValueError(f"Não foi possível identificar o TIFF '{file_path}': {e}")
+        if mode not in _TIFF_MEMMAP_MODES:
+            raise ValueError(f"Modo TIFF não suportado para mapeamento em memória: '{mode}'.")
+        pixel_dtype, channels = _TIFF_MEMMAP_MODES[mode]
+        row_bytes = width * int(np.prod(channels, dtype=np.int64)) * np.dtype(pixel_dtype).itemsize
+
+        tiles.sort(key=lambda tile: tile[1][1])
+        first_offset = tiles[0][2]
+        for codec_name, (x0, y0, x1, _), offset, args in tiles:
+            contiguous = (codec_name == 'raw' and args[0] == mode and x0 == 0 and x1 == width
+                          and offset == first_offset + y0 * row_bytes)
+            if not contiguous:
+                raise ValueError("Apenas TIFF sem compressão com faixas contíguas pode ser "
+                                 "mapeado em memória; converta o arquivo para .npy.")
+        return np.memmap(file_path, dtype=pixel_dtype, mode='r', offset=first_offset,
+                         shape=(height, width) + channels)
+
+    raise ValueError(f"Formato não suportado para leitura em faixas: '{extension}'.")
+
+# --- Redimensionamento em Faixas ---
+
+def compute_band_rows(source_shape: Tuple[int, ...], source_itemsize: int,
+                      target_hw: Tuple[int, int], taps: int, memory_budget_bytes: int) -> int:
+    """
+    Calcula quantas linhas de saída podem ser processadas por faixa dentro do orçamento.
+
+    A estimativa considera a faixa de origem lida do disco (incluindo o halo de
+    `taps` linhas extras da interpolação) e os arrays float32 temporários das
+    passagens vertical e horizontal.
+
+    Args:
+        source_shape: Shape da imagem de origem.
+        source_itemsize: Tamanho em bytes de cada valor de pixel da origem.
+        target_hw: Tupla (altura, largura) de destino.
+        taps: Número de linhas de origem que cada linha de saída combina.
+        memory_budget_bytes: Orçamento de memória em bytes.
+
+    Returns:
+        Número de linhas de saída por faixa (pelo menos 1).
+
+    Raises:
+        ValueError: Se o orçamento não comporta nem uma linha de saída.
+    """
+    source_height, source_width = source_shape[:2]
+    target_height, target_width = target_hw
+    channels = int(np.prod(source_shape[2:], dtype=np.int64))
+
+    source_row_bytes = source_width * channels * source_itemsize
+    # Linhas de origem por linha de saída, mais as cópias float32 de cada passagem
+    # (contribuição do tap e acumulador) na largura de origem e de destino
+    bytes_per_output_row = (int(np.ceil(source_height / target_height)) * source_row_bytes
+                            + 2 * source_width * channels * 4
+                            + 2 * target_width * channels * 4)
+    halo_bytes = taps * source_row_bytes
+
+    band_rows = (memory_budget_bytes - halo_bytes) // bytes_per_output_row
+    if band_rows < 1:
+        raise ValueError(f"Orçamento de memória de {memory_budget_bytes} bytes é pequeno demais; "
+                         f"são necessários pelo menos {halo_bytes + bytes_per_output_row} bytes.")
+    return int(min(band_rows, target_height))
+
+def resize_out_of_core(source: Union[str, np.ndarray],
+                       target_hw: Tuple[int, int],
+                       method: str = 'area',
+                       memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES,
+                       output_path: Optional[str] = None) -> np.ndarray:
+    """
+    Redimensiona uma imagem maior que a memória processando faixas horizontais.
+
+    A origem é lida em faixas de linhas a partir de um array mapeado em memória.
+    Para cada faixa de linhas de saída, apenas as linhas de origem que ela usa
+    (incluindo o halo da interpolação) são carregadas; as linhas são reamostradas
+    e depois as colunas, e a faixa resultante é escrita na saída antes de passar
+    à próxima. O pico de memória fica limitado por `memory_budget_bytes`.
+
+    Args:
+        source: Caminho (.npy, .tif sem compressão) ou array (possivelmente np.memmap)
+                com shape (H, W) ou (H, W, C).
+        target_hw: Tupla (altura, largura) de destino.
+        method: 'nearest', 'area' ou 'bilinear'. O resultado é igual ao de
+                `get_resample_plan(...).execute` com o mesmo método; 'nearest' usa o
+                pixel do canto superior esquerdo, como `downsample_nearest_neighbor`.
+        memory_budget_bytes: Orçamento de memória para as faixas em processamento.
+        output_path: Se informado, a saída é gravada incrementalmente em um .npy
+                     mapeado em memória nesse caminho; caso contrário, é um array
+                     em memória.
+
+    Returns:
+        Array NumPy (ou np.memmap) com a imagem redimensionada, no dtype da origem.
+
+    Raises:
+        ValueError: Para método, dimensões ou orçamento inválidos.
+    """
+    if isinstance(source, str):
+        source = open_image_memmap(source)
+    if source.ndim not in (2, 3):
+        raise ValueError(f"A imagem deve ser 2D ou 3D, recebido shape {source.shape}.")
+    target_height, target_width = target_hw
+    if target_height <= 0 or target_width <= 0:
+        raise ValueError("As dimensões de destino devem ser positivas.")
+
+    source_height, source_width = source.shape[:2]
+    row_indices, row_weights = compute_axis_taps(source_height, target_height, method)
+    col_indices, col_weights = compute_axis_taps(source_width, target_width, method)
+
+    target_shape = (target_height, target_width) + source.shape[2:]
+    if output_path:
+        output = np.lib.format.open_memmap(output_path, mode='w+', dtype=source.dtype, shape=target_shape)
+    else:
+        output = np.empty(target_shape, dtype=source.dtype)
+
+    band_rows = compute_band_rows(source.shape, source.dtype.itemsize, target_hw,
+                                  row_indices.shape[1], memory_budget_bytes)
+    is_integer = np.issubdtype(source.dtype, np.integer)
+
+    for band_start in range(0, target_height, band_rows):
+        band_end = min(band_start + band_rows, target_height)
+        band_row_indices = row_indices[band_start:band_end]
+
+        # Apenas as linhas de origem usadas por esta faixa (com o halo) são lidas
+        first_row = int(band_row_indices.min())
+        last_row = int(band_row_indices.max()) + 1
+        strip = np.asarray(source[first_row:last_row])
+
+        band = apply_axis_weights(strip, band_row_indices - first_row,
+                                  row_weights[band_start:band_end], axis=0)
+        band = apply_axis_weights(band, col_indices, col_weights, axis=1)
+
+        if is_integer:
+            info = np.iinfo(source.dtype)
+            band = np.clip(np.rint(band), info.min, info.max)
+        output[band_start:band_end] = band
+
+    if isinstance(output, np.memmap):
+        output.flush()
+    return output
+
+# --- Bloco de Execução Principal ---
+
+if __name__ == '__main__':
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    input_image_filename = "brat.jpeg"
+    input_image_path = os.path.join(script_dir, input_image_filename)
+
+    output_dir_path = os.path.join(script_dir, "resultados_redimensionamento_em_faixas")
+    os.makedirs(output_dir_path, exist_ok=True)
+
+    base_name = os.path.splitext(input_image_filename)[0]
+    try:
+        # Em produção a origem já estaria em disco como .npy/.tif; aqui ela é gerada a partir do JPEG
+        with Image.open(input_image_path) as pil_image:
+            gray = np.array(pil_image.convert('L'))
+        source_npy_path = os.path.join(output_dir_path, f"{base_name}_gray.npy")
+        np.save(source_npy_path, gray)
+
+        target_hw = (gray.shape[0] // 3, gray.shape[1] // 3)
+        for method in ('nearest', 'area', 'bilinear'):
+            output_npy_path = os.path.join(output_dir_path, f"{base_name}_{method}.npy")
+            reduced = resize_out_of_core(source_npy_path, target_hw, method=method,
+                                         memory_budget_bytes=1024 * 1024, output_path=output_npy_path)
+            output_image_path = os.path.join(output_dir_path, f"{base_name}_{method}.png")
+            Image.fromarray(np.asarray(reduced)).save(output_image_path)
+            print(f"Redução '{method}' {gray.shape} -> {reduced.shape} salva em '{output_image_path}'.")
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de imagem não encontrado em '{input_image_path}'.")
+    except ValueError as ve:
+        print(f"Erro de valor: {ve}")
@@ -1,8 +1,20 @@
 import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from PIL import Image, UnidentifiedImageError
 import matplotlib.pyplot as plt
-from typing import Tuple, Union
+from typing import Dict, Optional, Tuple, Union
+
+from reamostragem import get_resample_plan
+
+# Number of bilinear_interpolation(_batch) calls per dispatch path ('identity', 'block_average', 'generic')
+_path_stats: Counter = Counter()
+
+# Thread pools reused across calls, one per worker count (created on first use)
+_band_executors: Dict[int, ThreadPoolExecutor] = {}
+_band_executors_lock = threading.Lock()
 
 # --- Standardized Helper Functions ---
 
@@ -88,79 +100,254 @@ def convert_pil_to_grayscale(image: Image.Image) -> Image.Image:
 
 # --- Core Reduction Function (Refactored) ---
 
-def bilinear_interpolation(pixels: np.ndarray, new_size_wh: Tuple[int, int]) -> np.ndarray:
+def block_average_reduction(pixels: np.ndarray, factor_rows: int, factor_cols: int,
+                            row_axis: int = 0, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Reduces an image by exact integer factors, averaging each factor_rows x factor_cols block.
+
+    The rows of each block are summed first (whole contiguous rows, reshaped
+    as (H/fr, fr, W[, C])) and then the columns (reshaped as (H/fr, W/fc, fc[, C])),
+    each offset added as a strided view into an integer accumulator; no index
+    tables or floating point are involved. This is a box (area) average: every
+    source pixel contributes, which avoids the aliasing of sampling only two
+    of them, and for a factor of 2 it coincides with bilinear interpolation
+    with half-pixel centers. The mean is rounded half to even, like the
+    np.rint of the generic path.
+
+    Args:
+        pixels: NumPy array (H x W or H x W x C), uint8, with H divisible by
+                factor_rows and W divisible by factor_cols.
+        factor_rows: Vertical reduction factor.
+        factor_cols: Horizontal reduction factor.
+        row_axis: Axis of the image rows; 1 for a stack (N, H, W[, C]).
+        out: Optional uint8 destination with the reduced shape.
+
+    Returns:
+        NumPy array of the reduced image, with dtype uint8 (`out` if given).
+    """
+    leading_shape = pixels.shape[:row_axis]
+    height, width = pixels.shape[row_axis:row_axis + 2]
+    new_height, new_width = height // factor_rows, width // factor_cols
+    channel_shape = pixels.shape[row_axis + 2:]
+    lead = (slice(None),) * row_axis
+    block_area = factor_rows * factor_cols
+    # 255 * block_area must fit in the accumulator
+    accumulator_dtype = np.uint16 if block_area <= 257 else np.uint32
+
+    rows = pixels.reshape(leading_shape + (new_height, factor_rows, width) + channel_shape)
+    row_sums = rows[lead + (slice(None), 0)].astype(accumulator_dtype)
+    for row_offset in range(1, factor_rows):
+        row_sums += rows[lead + (slice(None), row_offset)]
+
+    cols = row_sums.reshape(leading_shape + (new_height, new_width, factor_cols) + channel_shape)
+    block_sums = cols[lead + (slice(None), slice(None), 0)].copy()
+    for col_offset in range(1, factor_cols):
+        block_sums += cols[lead + (slice(None), slice(None), col_offset)]
+
+    # Round half to even: round up when twice the remainder exceeds the block
+    # area, or equals it and the quotient is odd
+    means = block_sums // block_area
+    block_sums -= means * block_area
+    block_sums *= 2
+    means += (block_sums > block_area) | ((block_sums == block_area) & (means % 2 == 1))
+    if out is None:
+        return means.astype(np.uint8)
+    np.copyto(out, means, casting='unsafe')
+    return out
+
+def get_band_executor(workers: int) -> ThreadPoolExecutor:
+    """
+    Returns the shared thread pool with `workers` threads, creating it on first use.
+
+    Args:
+        workers: Number of threads in the pool.
+
+    Returns:
+        A ThreadPoolExecutor kept alive for the rest of the process.
+    """
+    with _band_executors_lock:
+        executor = _band_executors.get(workers)
+        if executor is None:
+            executor = _band_executors[workers] = ThreadPoolExecutor(max_workers=workers,
+                                                                     thread_name_prefix='bilinear-band')
+        return executor
+
+def select_bilinear_path(source: np.ndarray, new_hw: Tuple[int, int], row_axis: int = 0) -> str:
+    """
+    Chooses the dispatch path of bilinear_interpolation and bilinear_interpolation_batch.
+
+    The path depends only on the geometry and dtype, never on workers,
+    fixed_point or reuse_output, so those options do not change the result.
+
+    Args:
+        source: Source image (or stack, with row_axis=1).
+        new_hw: Tuple (new_height, new_width).
+        row_axis: Axis of the image rows.
+
+    Returns:
+        'identity' (uint8, same size), 'block_average' (uint8, exact integer
+        reduction factors on both axes) or 'generic'.
     """
-    Reduces an image to new_size_wh using a manual pixel neighborhood averaging method.
+    if source.dtype != np.uint8:
+        return 'generic'
+    height, width = source.shape[row_axis:row_axis + 2]
+    new_height, new_width = new_hw
+    if (height, width) == (new_height, new_width):
+        return 'identity'
+    if height % new_height == 0 and width % new_width == 0:
+        return 'block_average'
+    return 'generic'
+
+def get_bilinear_path_stats() -> Dict[str, int]:
+    """
+    Returns how many bilinear_interpolation(_batch) calls took each path.
 
-    The function iterates through each pixel of the target (reduced) image. For each
-    target pixel, it maps its coordinates back to the source (original) image.
-    It then takes four pixels from the source image: the pixel at the mapped
-    top-left coordinate, and its neighbors to the right, below, and diagonally
-    bottom-right. These four source pixels are averaged to compute the value
-    for the target pixel.
+    Returns:
+        Dictionary {'identity': n, 'block_average': n, 'generic': n} (paths
+        never taken are omitted).
+    """
+    return dict(_path_stats)
 
-    When new_size_wh is exactly half the original dimensions (2x reduction),
-    this method effectively averages 2x2 blocks of pixels from the original image.
+def reset_bilinear_path_stats() -> None:
+    """Resets the per-path call counters."""
+    _path_stats.clear()
 
-    Note: The name 'bilinear_interpolation' is retained from the original script.
-    However, this implementation is a specific form of neighborhood averaging.
-    For true bilinear interpolation (which involves weighted averages based on
-    sub-pixel distances), consider using established library functions, e.g.,
-    `PIL.Image.Image.resize(new_size_wh, Image.Resampling.BILINEAR)`.
+def bilinear_interpolation(pixels: np.ndarray, new_size_wh: Tuple[int, int],
+                           reuse_output: bool = False, fixed_point: bool = False,
+                           workers: Optional[int] = None) -> np.ndarray:
+    """
+    Resizes an image to new_size_wh using separable bilinear interpolation.
+
+    The index and weight tables are computed once per axis. The rows of the
+    output are interpolated first (a weighted blend of two source rows), then
+    the columns of that intermediate result, each as a whole-array operation.
+    Works for any target size, both for reduction and enlargement, and for
+    grayscale (H x W) as well as color (H x W x C) images.
+
+    The tables and work buffers live in a cached ResamplePlan (see
+    reamostragem.py), so repeated calls with the same source/target geometry
+    skip all setup.
+
+    For uint8 input two geometries are handled differently, whatever the
+    options (see select_bilinear_path and get_bilinear_path_stats):
+    - same size as the source: the input array itself is returned (an alias,
+      not a copy), here and in bilinear_interpolation_batch;
+    - height and width are exact integer multiples of the new size: the result
+      is a box average of each block (block_average_reduction), not bilinear
+      interpolation. Both agree for a factor of 2; for larger factors every
+      source pixel is averaged.
 
     Args:
         pixels: NumPy array representing the source image (H x W for grayscale,
                 H x W x C for color). Expected dtype is uint8 or similar.
         new_size_wh: Tuple (new_width, new_height) for the output image.
+        reuse_output: If True, the result is written into the plan's
+                      preallocated output buffer instead of a new array. That
+                      buffer is overwritten by the next call with the same geometry.
+        fixed_point: If True (uint8 input only), use the integer fixed-point
+                     path: 8-bit weights, uint16/uint32 accumulators and no
+                     float conversion. Results are within one gray level of
+                     the float path. The box average is already integer
+                     arithmetic, so this has no effect on exact ratios.
+        workers: If greater than 1, the output is split into that many
+                 horizontal bands, which are resized concurrently on a shared
+                 thread pool (see get_band_executor; NumPy releases the GIL
+                 inside the array operations). Every band writes its own
+                 slice of one output array. None or 1 runs single-threaded.
 
     Returns:
-        NumPy array of the reduced image, with dtype uint8.
+        NumPy array of the resized image, with dtype uint8.
+
+    Raises:
+        ValueError: If the new dimensions are not positive.
     """
-    original_height, original_width = pixels.shape[:2]
-    
-    is_color = pixels.ndim == 3
-    if is_color:
-        num_channels = pixels.shape[2]
-    
     new_width, new_height = new_size_wh
 
     if new_width <= 0 or new_height <= 0:
         raise ValueError("New dimensions (width and height) must be positive.")
-
-    # Initialize the output array for reduced pixels
-    if is_color:
-        reduced_pixels = np.zeros((new_height, new_width, num_channels), dtype=np.float32)
+    if pixels.ndim not in (2, 3):
+        raise ValueError(f"Unsupported NumPy array ndim for interpolation: {pixels.ndim}")
+
+    height, width = pixels.shape[:2]
+    path = select_bilinear_path(pixels, (new_height, new_width))
+    _path_stats[path] += 1
+    if path == 'identity':
+        return pixels
+
+    band_count = 1 if workers is None or workers <= 1 else min(workers, new_height)
+    if path == 'block_average':
+        factor_rows, factor_cols = height // new_height, width // new_width
+        # Only needed for its shared output buffer (and lock) when reuse_output is set
+        plan = get_resample_plan(pixels, (new_height, new_width), 'bilinear') if reuse_output else None
+
+        def compute_rows(target: np.ndarray, row_start: int, row_end: int) -> None:
+            block_average_reduction(pixels[row_start * factor_rows:row_end * factor_rows],
+                                    factor_rows, factor_cols, out=target[row_start:row_end])
     else:
-        reduced_pixels = np.zeros((new_height, new_width), dtype=np.float32)
-
-    for r_new in range(new_height):  # Index for rows in the new image
-        for c_new in range(new_width):   # Index for columns in the new image
-            
-            # Map new pixel's top-left corresponding coordinate in original image
-            r_orig_tl = r_new * original_height // new_height
-            c_orig_tl = c_new * original_width // new_width
-
-            # Define the four source pixels (top-left, top-right, bottom-left, bottom-right of a 2x2-like region)
-            # Ensure indices are within bounds of the original image
-            r_orig_br = min(r_orig_tl + 1, original_height - 1)
-            c_orig_br = min(c_orig_tl + 1, original_width - 1)
-
-            if is_color:
-                p_tl = pixels[r_orig_tl, c_orig_tl, :].astype(np.float32)
-                p_tr = pixels[r_orig_tl, c_orig_br, :].astype(np.float32)
-                p_bl = pixels[r_orig_br, c_orig_tl, :].astype(np.float32)
-                p_br = pixels[r_orig_br, c_orig_br, :].astype(np.float32)
-            else: # Grayscale
-                p_tl = float(pixels[r_orig_tl, c_orig_tl])
-                p_tr = float(pixels[r_orig_tl, c_orig_br])
-                p_bl = float(pixels[r_orig_br, c_orig_tl])
-                p_br = float(pixels[r_orig_br, c_orig_br])
-            
-            # Average the four points
-            average_value = (p_tl + p_tr + p_bl + p_br) / 4.0
-            reduced_pixels[r_new, c_new] = average_value
-            
-    return np.clip(reduced_pixels, 0, 255).astype(np.uint8)
+        plan = get_resample_plan(pixels, (new_height, new_width), 'bilinear', fixed_point=fixed_point)
+        if band_count == 1:
+            return plan.execute(pixels, out=None if reuse_output else np.empty(plan.target_shape, dtype=np.uint8))
+
+        def compute_rows(target: np.ndarray, row_start: int, row_end: int) -> None:
+            plan.execute_rows(pixels, target, row_start, row_end)
+
+    def run_bands(target: np.ndarray) -> np.ndarray:
+        if band_count == 1:
+            compute_rows(target, 0, new_height)
+            return target
+        band_edges = np.linspace(0, new_height, band_count + 1).astype(int)
+        executor = get_band_executor(workers)
+        futures = [executor.submit(compute_rows, target, int(start), int(end))
+                   for start, end in zip(band_edges[:-1], band_edges[1:])]
+        for future in futures:
+            future.result()
+        return target
+
+    if not reuse_output:
+        return run_bands(np.empty((new_height, new_width) + pixels.shape[2:], dtype=np.uint8))
+    # The plan's output buffer is shared with every caller of the same geometry
+    with plan.lock:
+        return run_bands(plan.output)
+
+def bilinear_interpolation_batch(stack: np.ndarray, new_size_wh: Tuple[int, int],
+                                 fixed_point: bool = False) -> np.ndarray:
+    """
+    Resizes every image of a stack with separable bilinear interpolation.
+
+    The whole stack is processed in one vectorized pass with a single set of
+    index/weight tables (one cached ResamplePlan for the stack geometry). The
+    path is chosen as in bilinear_interpolation, so every frame matches a
+    per-frame call.
+
+    Args:
+        stack: NumPy array of shape (N, H, W) or (N, H, W, C).
+        new_size_wh: Tuple (new_width, new_height) for every output frame.
+        fixed_point: If True (uint8 input only), use the integer fixed-point path.
+
+    Returns:
+        NumPy array of shape (N, new_height, new_width[, C]), dtype uint8
+        (contiguous, except for the identity path, which returns `stack`).
+
+    Raises:
+        ValueError: If the new dimensions are not positive or the stack shape is invalid.
+    """
+    new_width, new_height = new_size_wh
+
+    if new_width <= 0 or new_height <= 0:
+        raise ValueError("New dimensions (width and height) must be positive.")
+    if stack.ndim not in (3, 4):
+        raise ValueError(f"Unsupported NumPy array ndim for batch interpolation: {stack.ndim}")
+
+    height, width = stack.shape[1:3]
+    path = select_bilinear_path(stack, (new_height, new_width), row_axis=1)
+    _path_stats[path] += 1
+    if path == 'identity':
+        return stack
+    if path == 'block_average':
+        return block_average_reduction(stack, height // new_height, width // new_width, row_axis=1)
+
+    plan = get_resample_plan(stack, (new_height, new_width), 'bilinear', batched=True, fixed_point=fixed_point)
+    return plan.execute(stack, out=np.empty(plan.target_shape, dtype=np.uint8))
 
 # --- Plotting Function ---
 
@@ -249,6 +436,7 @@ if __name__ == '__main__':
         print("Performing image reduction...")
         reduced_numpy_gray = bilinear_interpolation(original_numpy_gray, target_size_wh)
         print(f"Reduced image shape: {reduced_numpy_gray.shape}")
+        print(f"Interpolation paths taken: {get_bilinear_path_stats()}")
 
         # 5. Save the reduced image
         output_image_filename = f"{os.path.splitext(input_image_filename)[0]}_reducao_bilinear.jpeg"
@@ -263,7 +451,7 @@ if __name__ == '__main__':
             original_numpy_gray,
             reduced_numpy_gray,
             title_original=f"Original Grayscale ({input_image_filename})",
-            title_reduced=f"Reduced (Custom Method, Factor 0.5)",
+            title_reduced=f"Reduced (Bilinear, Factor 0.5)",
             output_path=plot_output_path
         )
         print("Processing complete.")
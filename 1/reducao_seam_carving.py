@@ -0,0 +1,294 @@
+import os
+import sys
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+from typing import Tuple, Union
+
+# O mapa de energia usa o filtro de Sobel do módulo de gradiente (pasta 5)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '5'))
+from gradiente import sobel_filter_manual  # noqa: E402
+
+# Núcleos de Sobel, iguais aos de `sobel_filter_manual`, para a atualização local da energia
+_SOBEL_X = np.array([[-1, 0, 1],
+                     [-2, 0, 2],
+                     [-1, 0, 1]], dtype=np.float32)
+_SOBEL_Y = _SOBEL_X.T.copy()
+
+# Pesos de luminância do modo 'L' da PIL (ITU-R 601-2)
+_LUMA_WEIGHTS = np.array([299, 587, 114], dtype=np.float32) / 1000
+
+# --- Funções Auxiliares Padronizadas ---
+
+def load_pil_image(file_path: str) -> Union[Image.Image, None]:
+    """
+    Carrega uma imagem a partir do caminho do arquivo usando Pillow.
+
+    Args:
+        file_path: Caminho para o arquivo de imagem.
+
+    Returns:
+        Um objeto Image da PIL se o carregamento for bem-sucedido, None caso contrário.
+    """
+    try:
+        img = Image.open(file_path)
+        return img
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de imagem não encontrado em '{file_path}'.")
+    except UnidentifiedImageError:
+        print(f"Erro: Não foi possível identificar o arquivo de imagem. Pode estar corrompido ou não ser um formato suportado: '{file_path}'.")
+    except Exception as e:
+        print(f"Um erro inesperado ocorreu ao carregar a imagem '{file_path}': {e}")
+    return None
+
+def save_numpy_as_image(array: np.ndarray, file_path: str) -> None:
+    """
+    Salva um array NumPy (uint8) como um arquivo de imagem usando Pillow.
+
+    Args:
+        array: O array NumPy representando a imagem.
+        file_path: Caminho para salvar o arquivo de imagem.
+    """
+    try:
+        Image.fromarray(array.astype(np.uint8)).save(file_path)
+        print(f"Imagem salva com sucesso em '{file_path}'.")
+    except Exception as e:
+        print(f"Erro ao salvar imagem em '{file_path}': {e}")
+
+# --- Energia ---
+
+def compute_energy(gray: np.ndarray) -> np.ndarray:
+    """
+    Calcula o mapa de energia completo: a magnitude do gradiente de Sobel.
+
+    Args:
+        gray: Array NumPy 2D da imagem em tons de cinza.
+
+    Returns:
+        Array NumPy float32 (H, W) com a energia de cada pixel.
+    """
+    _, _, magnitude = sobel_filter_manual(gray)
+    return magnitude
+
+def sobel_magnitude_at(gray: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """
+    Calcula a magnitude de Sobel apenas nas posições (rows, cols).
+
+    Usa os mesmos núcleos e a mesma replicação de bordas de `sobel_filter_manual`,
+    com aritmética float32, então o resultado é idêntico ao do mapa completo
+    nessas posições. As vizinhanças 3x3 de todas as posições são lidas de uma vez.
+
+    Args:
+        gray: Array NumPy 2D float32 da imagem em tons de cinza.
+        rows: Índices de linha das posições.
+        cols: Índices de coluna das posições.
+
+    Returns:
+        Array NumPy float32 com a energia de cada posição.
+    """
+    height, width = gray.shape
+    grad_x = np.zeros(rows.shape, dtype=np.float32)
+    grad_y = np.zeros(rows.shape, dtype=np.float32)
+    for row_offset in (-1, 0, 1):
+        neighbor_rows = np.clip(rows + row_offset, 0, height - 1)
+        for col_offset in (-1, 0, 1):
+            neighbor = gray[neighbor_rows, np.clip(cols + col_offset, 0, width - 1)]
+            grad_x += neighbor * _SOBEL_X[row_offset + 1, col_offset + 1]
+            grad_y += neighbor * _SOBEL_Y[row_offset + 1, col_offset + 1]
+    return np.sqrt(grad_x ** 2 + grad_y ** 2)
+
+def to_gray_float32(pixels: np.ndarray) -> np.ndarray:
+    """
+    Converte a imagem em um array float32 de tons de cinza (luminância para cores).
+
+    Args:
+        pixels: Array NumPy (H, W) ou (H, W, C) com C >= 3.
+
+    Returns:
+        Array NumPy float32 (H, W).
+    """
+    if pixels.ndim == 2:
+        return pixels.astype(np.float32)
+    return np.rint(pixels[..., :3].astype(np.float32) @ _LUMA_WEIGHTS)
+
+# --- Costuras ---
+
+def find_vertical_seam(energy: np.ndarray) -> np.ndarray:
+    """
+    Encontra a costura vertical de menor energia por programação dinâmica.
+
+    Cada linha da tabela de custo acumulado é calculada de uma vez a partir da
+    linha anterior: o custo de um pixel é sua energia mais o menor custo entre
+    os três vizinhos de cima (diagonal esquerda, acima, diagonal direita).
+
+    Args:
+        energy: Array NumPy 2D (H, W) com o mapa de energia.
+
+    Returns:
+        Array NumPy int64 (H,) com a coluna da costura em cada linha.
+    """
+    height, width = energy.shape
+    # Deslocamento escolhido (-1, 0 ou +1) em cada pixel, para reconstruir a costura
+    backtrack = np.empty((height, width), dtype=np.int8)
+    cost = energy[0].astype(np.float64)
+    candidates = np.full((3, width), np.inf)
+    for row in range(1, height):
+        candidates[0, 1:] = cost[:-1]
+        candidates[1] = cost
+        candidates[2, :-1] = cost[1:]
+        choice = np.argmin(candidates, axis=0)
+        cost = energy[row] + candidates[choice, np.arange(width)]
+        backtrack[row] = choice - 1
+
+    seam = np.empty(height, dtype=np.int64)
+    seam[-1] = int(np.argmin(cost))
+    for row in range(height - 1, 0, -1):
+        seam[row - 1] = seam[row] + backtrack[row, seam[row]]
+    return seam
+
+def remove_vertical_seam(array: np.ndarray, seam: np.ndarray) -> np.ndarray:
+    """
+    Remove um pixel por linha (a costura) de um array (H, W) ou (H, W, C).
+
+    Args:
+        array: Array NumPy a ser reduzido em uma coluna.
+        seam: Coluna removida em cada linha.
+
+    Returns:
+        Novo array NumPy com shape (H, W - 1[, C]).
+    """
+    height, width = array.shape[:2]
+    keep = np.ones((height, width), dtype=bool)
+    keep[np.arange(height), seam] = False
+    return array[keep].reshape((height, width - 1) + array.shape[2:])
+
+def update_energy_around_seam(energy: np.ndarray, gray: np.ndarray, seam: np.ndarray) -> None:
+    """
+    Recalcula in place a energia só nos pixels cuja vizinhança mudou com a costura.
+
+    Depois de remover a coluna seam[r] da linha r, a vizinhança 3x3 muda apenas
+    para os pixels próximos da costura nas linhas r - 1, r e r + 1. Como a
+    costura anda no máximo uma coluna por linha, basta recalcular as colunas
+    seam[r] - 2 .. seam[r] + 1 (já nas coordenadas da imagem reduzida).
+
+    Args:
+        energy: Mapa de energia já sem a costura, (H, W - 1).
+        gray: Imagem em cinza float32 já sem a costura, (H, W - 1).
+        seam: Costura removida (coordenadas anteriores à remoção).
+    """
+    height, width = gray.shape
+    rows = np.repeat(np.arange(height), 4)
+    cols = (seam[:, None] + np.arange(-2, 2)).ravel()
+    inside = (cols >= 0) & (cols < width)
+    rows, cols = rows[inside], cols[inside]
+    energy[rows, cols] = sobel_magnitude_at(gray, rows, cols)
+
+def remove_vertical_seams(pixels: np.ndarray, gray: np.ndarray, energy: np.ndarray,
+                          count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Remove `count` costuras verticais, atualizando a energia só ao redor de cada uma.
+
+    Args:
+        pixels: Imagem (H, W) ou (H, W, C).
+        gray: Imagem em cinza float32 (H, W).
+        energy: Mapa de energia (H, W) correspondente.
+        count: Número de colunas a remover.
+
+    Returns:
+        Tupla (pixels, gray, energy) reduzidos em `count` colunas.
+    """
+    for _ in range(count):
+        seam = find_vertical_seam(energy)
+        pixels = remove_vertical_seam(pixels, seam)
+        gray = remove_vertical_seam(gray, seam)
+        energy = remove_vertical_seam(energy, seam)
+        update_energy_around_seam(energy, gray, seam)
+    return pixels, gray, energy
+
+# --- Função Principal de Redução ---
+
+def seam_carving_reduction(pixels: np.ndarray, new_size_wh: Tuple[int, int]) -> np.ndarray:
+    """
+    Reduz uma imagem sensível ao conteúdo, removendo costuras de baixa energia.
+
+    A energia é a magnitude do gradiente de Sobel (`sobel_filter_manual`), calculada
+    uma única vez para a imagem inteira. Primeiro são removidas costuras verticais
+    (largura) e depois horizontais (altura); as horizontais são tratadas como
+    verticais da imagem transposta, e a energia de Sobel é invariante à
+    transposição (Gx e Gy apenas trocam de lugar), então o mapa também é
+    reaproveitado.
+
+    Args:
+        pixels: Array NumPy (H, W) ou (H, W, C) da imagem de origem.
+        new_size_wh: Tupla (nova_largura, nova_altura), cada uma no máximo o tamanho original.
+
+    Returns:
+        Array NumPy com shape (nova_altura, nova_largura[, C]), no dtype da origem.
+
+    Raises:
+        ValueError: Se as dimensões forem inválidas ou maiores que as da origem.
+    """
+    new_width, new_height = new_size_wh
+    if pixels.ndim not in (2, 3):
+        raise ValueError(f"A imagem deve ser 2D ou 3D, recebido ndim={pixels.ndim}.")
+    height, width = pixels.shape[:2]
+    if not (0 < new_width <= width and 0 < new_height <= height):
+        raise ValueError(f"Seam carving só reduz: {width}x{height} -> {new_width}x{new_height} é inválido.")
+
+    gray = to_gray_float32(pixels)
+    energy = compute_energy(gray)
+
+    pixels, gray, energy = remove_vertical_seams(pixels, gray, energy, width - new_width)
+    if new_height < height:
+        axes = (1, 0) + tuple(range(2, pixels.ndim))
+        pixels, gray, energy = remove_vertical_seams(
+            pixels.transpose(axes), gray.T, energy.T, height - new_height)
+        pixels = pixels.transpose(axes)
+    return np.ascontiguousarray(pixels)
+
+def seam_carving_to_aspect(pixels: np.ndarray, aspect_wh: Tuple[int, int]) -> np.ndarray:
+    """
+    Ajusta a imagem a uma proporção largura:altura removendo costuras de um só eixo.
+
+    Args:
+        pixels: Array NumPy (H, W) ou (H, W, C).
+        aspect_wh: Proporção desejada, ex.: (1, 1) ou (4, 3).
+
+    Returns:
+        Array NumPy com a maior região possível na proporção pedida.
+    """
+    height, width = pixels.shape[:2]
+    aspect_width, aspect_height = aspect_wh
+    if width * aspect_height > height * aspect_width:
+        new_size_wh = (max(1, height * aspect_width // aspect_height), height)
+    else:
+        new_size_wh = (width, max(1, width * aspect_height // aspect_width))
+    return seam_carving_reduction(pixels, new_size_wh)
+
+# --- Bloco de Execução Principal ---
+
+if __name__ == '__main__':
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    input_image_filename = "brat.jpeg"
+    input_image_path = os.path.join(script_dir, input_image_filename)
+
+    output_dir_path = os.path.join(script_dir, "resultados_seam_carving")
+    os.makedirs(output_dir_path, exist_ok=True)
+
+    print(f"Carregando imagem: '{input_image_path}'...")
+    pil_image = load_pil_image(input_image_path)
+
+    if pil_image:
+        # O filtro de Sobel manual percorre pixel a pixel; meia resolução mantém a demonstração rápida
+        pil_image = pil_image.convert('RGB').reduce(2)
+        rgb_numpy = np.array(pil_image)
+        base_name = os.path.splitext(input_image_filename)[0]
+
+        try:
+            print(f"Ajustando {rgb_numpy.shape[1]}x{rgb_numpy.shape[0]} para a proporção 4:3...")
+            carved_numpy = seam_carving_to_aspect(rgb_numpy, (4, 3))
+            print(f"Imagem reduzida: {carved_numpy.shape}")
+            save_numpy_as_image(carved_numpy, os.path.join(output_dir_path, f"{base_name}_seam_carving_4x3.png"))
+        except ValueError as ve:
+            print(f"Erro de valor: {ve}")
+    else:
+        print(f"Não foi possível carregar a imagem '{input_image_path}'. Encerrando script.")
@@ -4,6 +4,9 @@ from PIL import Image, UnidentifiedImageError
 import matplotlib.pyplot as plt
 from typing import Union, Tuple
 
+from reamostragem import (FIXED_POINT_BITS, apply_axis_weights, apply_axis_weights_fixed,
+                          compute_area_coverage_weights, quantize_axis_weights)
+
 # --- Standardized Helper Functions ---
 
 def load_pil_image(file_path: str) -> Union[Image.Image, None]:
@@ -87,33 +90,150 @@ def convert_pil_to_grayscale(image: Image.Image) -> Image.Image:
 
 # --- Core Reduction Function (Refactored) ---
 
-def downsample_nearest_neighbor(pixels: np.ndarray, factor: int = 2) -> np.ndarray:
+def downsample_axes(pixels: np.ndarray, factor: Union[int, float], mode: str, row_axis: int,
+                    fixed_point: bool = False) -> np.ndarray:
     """
-    Reduces the image size by an integer factor using the nearest neighbor method.
-    This is achieved by selecting pixels at intervals defined by the factor.
-    For example, a factor of 2 means every other pixel is selected.
+    Reduces the two spatial axes (row_axis, row_axis + 1) of an array by a factor.
+
+    Shared core of downsample_nearest_neighbor (row_axis=0, one image) and
+    downsample_nearest_neighbor_batch (row_axis=1, a stack of images). Axes
+    before row_axis are batch axes, axes after the column axis are channels.
 
     Args:
-        pixels: NumPy array representing the image (H x W or H x W x C).
-        factor: The integer factor by which to reduce the image dimensions.
-                Must be greater than 0.
+        pixels: NumPy array with the spatial axes at row_axis and row_axis + 1.
+        factor: Reduction factor (see downsample_nearest_neighbor).
+        mode: 'nearest' or 'area'.
+        row_axis: Index of the row axis.
+        fixed_point: Use integer fixed-point weights for non-integer area factors.
 
     Returns:
-        NumPy array of the reduced image.
+        NumPy array of the reduced image(s), with the same dtype as the input.
 
     Raises:
-        ValueError: If the factor is not a positive integer.
+        ValueError: If the factor or mode is invalid.
     """
-    if not isinstance(factor, int) or factor <= 0:
-        raise ValueError("Reduction factor must be a positive integer.")
-    
-    if pixels.ndim == 2:  # Grayscale
-        reduced_pixels = pixels[::factor, ::factor]
-    elif pixels.ndim == 3:  # Color
-        reduced_pixels = pixels[::factor, ::factor, :]
+    lead = (slice(None),) * row_axis
+
+    if mode == 'nearest':
+        if not isinstance(factor, int) or factor <= 0:
+            raise ValueError("Reduction factor must be a positive integer.")
+        return pixels[lead + (slice(None, None, factor), slice(None, None, factor))]
+
+    if mode != 'area':
+        raise ValueError(f"Unsupported downsampling mode: '{mode}'. Use 'nearest' or 'area'.")
+    if not isinstance(factor, (int, float)) or factor < 1:
+        raise ValueError("Area reduction factor must be a number greater than or equal to 1.")
+
+    height, width = pixels.shape[row_axis:row_axis + 2]
+    leading_shape, channel_shape = pixels.shape[:row_axis], pixels.shape[row_axis + 2:]
+    if float(factor).is_integer():
+        factor = int(factor)
+        new_height, new_width = height // factor, width // factor
+        if new_height == 0 or new_width == 0:
+            raise ValueError("Reduction factor is larger than the image dimensions.")
+        # Split each axis into (blocks, factor) and accumulate the factor x factor
+        # block offsets; each step adds a strided view of the whole image, so the
+        # loop runs factor**2 times regardless of the image size.
+        blocks = pixels[lead + (slice(new_height * factor), slice(new_width * factor))].reshape(
+            leading_shape + (new_height, factor, new_width, factor) + channel_shape
+        )
+        small_integer = pixels.dtype in (np.uint8, np.uint16)
+        block_sums = np.zeros(leading_shape + (new_height, new_width) + channel_shape,
+                              dtype=np.uint32 if small_integer else np.float64)
+        for row_offset in range(factor):
+            for col_offset in range(factor):
+                block_sums += blocks[lead + (slice(None), row_offset, slice(None), col_offset)]
+        block_area = factor * factor
+        if small_integer:
+            # Integer mean rounded half up, without going through floating point
+            return ((block_sums + block_area // 2) // block_area).astype(pixels.dtype)
+        reduced_pixels = block_sums / block_area
     else:
+        new_height = max(1, int(height / factor))
+        new_width = max(1, int(width / factor))
+        row_indices, row_weights = compute_area_coverage_weights(height, new_height)
+        col_indices, col_weights = compute_area_coverage_weights(width, new_width)
+        if fixed_point:
+            if pixels.dtype != np.uint8:
+                raise ValueError("The fixed-point path requires uint8 images.")
+            # uint8 -> uint16 (rows) -> uint32 (columns) with 8-bit weights, then round and shift back
+            reduced_rows = apply_axis_weights_fixed(pixels, row_indices, quantize_axis_weights(row_weights),
+                                                    axis=row_axis, accumulator_dtype=np.uint16)
+            reduced_pixels = apply_axis_weights_fixed(reduced_rows, col_indices, quantize_axis_weights(col_weights),
+                                                      axis=row_axis + 1, accumulator_dtype=np.uint32)
+            reduced_pixels += 1 << (2 * FIXED_POINT_BITS - 1)
+            reduced_pixels >>= 2 * FIXED_POINT_BITS
+            return reduced_pixels.astype(np.uint8)
+        reduced_pixels = apply_axis_weights(pixels, row_indices, row_weights, axis=row_axis)
+        reduced_pixels = apply_axis_weights(reduced_pixels, col_indices, col_weights, axis=row_axis + 1)
+
+    if np.issubdtype(pixels.dtype, np.integer):
+        info = np.iinfo(pixels.dtype)
+        reduced_pixels = np.clip(np.floor(reduced_pixels + 0.5), info.min, info.max)
+    return reduced_pixels.astype(pixels.dtype)
+
+def downsample_nearest_neighbor(pixels: np.ndarray, factor: Union[int, float] = 2, mode: str = 'nearest',
+                                fixed_point: bool = False) -> np.ndarray:
+    """
+    Reduces the image size by a factor.
+
+    With mode='nearest' (default) pixels are selected at intervals defined by
+    the integer factor; for example, a factor of 2 means every other pixel is
+    selected.
+
+    With mode='area' every output pixel is the average of the source area it
+    covers, which avoids the aliasing of the stride selection:
+    - Integer factors average non-overlapping factor x factor blocks of a
+      reshaped view. Trailing rows/columns that do not fill a whole block are
+      discarded.
+    - Non-integer factors (e.g. 1.5) use precomputed fractional pixel-coverage
+      weights, applied separably to rows and then columns. The output size is
+      floor(H / factor) x floor(W / factor). With fixed_point=True (uint8
+      only) these weights are quantized to 8 bits and the whole reduction
+      stays in integer arithmetic, within one gray level of the float result.
+      Integer factors are always computed with integer sums.
+
+    Args:
+        pixels: NumPy array representing the image (H x W or H x W x C).
+        factor: The factor by which to reduce the image dimensions. Must be a
+                positive integer for mode='nearest' and a number >= 1 for mode='area'.
+        mode: 'nearest' or 'area'.
+        fixed_point: Integer fixed-point path for non-integer area factors.
+
+    Returns:
+        NumPy array of the reduced image, with the same dtype as the input
+        (integer results are rounded half up).
+
+    Raises:
+        ValueError: If the factor or mode is invalid.
+    """
+    if pixels.ndim not in (2, 3):
         raise ValueError(f"Unsupported NumPy array ndim for downsampling: {pixels.ndim}")
-    return reduced_pixels
+    return downsample_axes(pixels, factor, mode, row_axis=0, fixed_point=fixed_point)
+
+def downsample_nearest_neighbor_batch(stack: np.ndarray, factor: Union[int, float] = 2, mode: str = 'nearest',
+                                      fixed_point: bool = False) -> np.ndarray:
+    """
+    Reduces every image of a stack in one vectorized pass.
+
+    Same semantics as downsample_nearest_neighbor, applied to all frames at
+    once with a single set of index/weight tables.
+
+    Args:
+        stack: NumPy array of shape (N, H, W) or (N, H, W, C).
+        factor: The reduction factor (see downsample_nearest_neighbor).
+        mode: 'nearest' or 'area'.
+        fixed_point: Integer fixed-point path for non-integer area factors.
+
+    Returns:
+        Contiguous NumPy array of shape (N, H', W'[, C]) with the input dtype.
+
+    Raises:
+        ValueError: If the stack shape, factor or mode is invalid.
+    """
+    if stack.ndim not in (3, 4):
+        raise ValueError(f"Unsupported NumPy array ndim for batch downsampling: {stack.ndim}")
+    return np.ascontiguousarray(downsample_axes(stack, factor, mode, row_axis=1, fixed_point=fixed_point))
 
 # --- Plotting Function ---
 
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import time
+import numpy as np
+from typing import Callable
+
+from mascara_binaria import load_packed_mask, save_packed_mask
+from rotulacao import save_array_as_text_matrix
+
+# Máscara de teste: retângulos aleatórios sobre fundo, como uma página digitalizada
+MASK_SHAPE = (2000, 3000)
+REPETITIONS = 3
+
+# --- Medição ---
+
+def best_time(function: Callable[[], object], repetitions: int = REPETITIONS) -> float:
+    """Retorna o menor tempo, em segundos, entre `repetitions` execuções de `function`."""
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def make_test_mask(shape: tuple, seed: int = 0) -> np.ndarray:
+    """Gera uma máscara uint8 (0/255) com retângulos aleatórios."""
+    rng = np.random.default_rng(seed)
+    mask = np.zeros(shape, dtype=np.uint8)
+    for _ in range(400):
+        top, left = rng.integers(0, shape[0]), rng.integers(0, shape[1])
+        mask[top:top + rng.integers(5, 80), left:left + rng.integers(5, 80)] = 255
+    return mask
+
+# --- Bloco de Execução Principal ---
+
+if __name__ == '__main__':
+    mask = make_test_mask(MASK_SHAPE)
+    print(f"Máscara {MASK_SHAPE}, melhor de {REPETITIONS} execuções")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        text_path = os.path.join(temp_dir, "mascara.txt")
+        packed_path = os.path.join(temp_dir, "mascara.bmask")
+
+        # save_array_as_text_matrix imprime a cada chamada; uma execução basta para o texto
+        text_write = best_time(lambda: save_array_as_text_matrix(mask, text_path), repetitions=1)
+        text_read = best_time(lambda: np.loadtxt(text_path, dtype=np.uint8), repetitions=1)
+        packed_write = best_time(lambda: save_packed_mask(mask, packed_path))
+        packed_read = best_time(lambda: load_packed_mask(packed_path, output='uint8'))
+        packed_read_bool = best_time(lambda: load_packed_mask(packed_path, output='bool'))
+
+        assert np.array_equal(load_packed_mask(packed_path), mask)
+        text_size, packed_size = os.path.getsize(text_path), os.path.getsize(packed_path)
+
+    print(f"{'formato':<18} {'tamanho (bytes)':>16} {'escrita (s)':>12} {'leitura (s)':>12}")
+    print(f"{'texto (savetxt)':<18} {text_size:>16} {text_write:>12.3f} {text_read:>12.3f}")
+    print(f"{'.bmask uint8':<18} {packed_size:>16} {packed_write:>12.4f} {packed_read:>12.4f}")
+    print(f"{'.bmask bool':<18} {packed_size:>16} {'':>12} {packed_read_bool:>12.4f}")
+    print(f"Redução de tamanho: {text_size / packed_size:.1f}x")
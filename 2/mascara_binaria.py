@@ -0,0 +1,154 @@
+import os
+import struct
+import numpy as np
+from typing import Tuple, Union
+
+# Formato .bmask: cabeçalho de 16 bytes seguido das linhas empacotadas com np.packbits.
+#   0  4s  assinatura b'BMSK'
+#   4  B   versão do formato
+#   5  B   ordem dos bits em cada byte (0 = 'big', 1 = 'little')
+#   6  H   reservado (0)
+#   8  I   altura (linhas)
+#   12 I   largura (pixels por linha)
+# Cada linha ocupa ceil(largura / 8) bytes, com os bits de preenchimento em 0.
+MASK_MAGIC = b'BMSK'
+MASK_VERSION = 1
+MASK_HEADER = struct.Struct('<4sBBHII')
+_BIT_ORDERS = ('big', 'little')
+
+# --- Escrita e Leitura ---
+
+def save_packed_mask(binary_array: np.ndarray, output_path: str, bitorder: str = 'big') -> None:
+    """
+    Salva uma máscara binária no formato .bmask (1 bit por pixel).
+
+    Args:
+        binary_array: Array NumPy 2D; pixels de objeto são 255 (uint8) ou True (bool).
+        output_path: Caminho do arquivo a ser gravado.
+        bitorder: Ordem dos bits em cada byte, 'big' (padrão) ou 'little'.
+
+    Raises:
+        ValueError: Se o array não for 2D ou a ordem dos bits for inválida.
+    """
+    if binary_array.ndim != 2:
+        raise ValueError(f"A máscara deve ser 2D, recebido shape {binary_array.shape}.")
+    if bitorder not in _BIT_ORDERS:
+        raise ValueError(f"Ordem de bits inválida: '{bitorder}'. Use 'big' ou 'little'.")
+    foreground = binary_array if binary_array.dtype == bool else binary_array == 255
+    height, width = foreground.shape
+    with open(output_path, 'wb') as mask_file:
+        mask_file.write(MASK_HEADER.pack(MASK_MAGIC, MASK_VERSION, _BIT_ORDERS.index(bitorder), 0, height, width))
+        mask_file.write(np.packbits(foreground, axis=1, bitorder=bitorder).tobytes())
+
+def read_packed_mask_header(file_path: str) -> Tuple[int, int, str]:
+    """
+    Lê e valida o cabeçalho de um arquivo .bmask.
+
+    Args:
+        file_path: Caminho do arquivo.
+
+    Returns:
+        Tupla (altura, largura, ordem dos bits).
+
+    Raises:
+        ValueError: Se o arquivo não for um .bmask válido.
+    """
+    with open(file_path, 'rb') as mask_file:
+        header = mask_file.read(MASK_HEADER.size)
+    if len(header) < MASK_HEADER.size:
+        raise ValueError(f"Arquivo '{file_path}' curto demais para um cabeçalho de máscara.")
+    magic, version, bitorder_code, _, height, width = MASK_HEADER.unpack(header)
+    if magic != MASK_MAGIC:
+        raise ValueError(f"Arquivo '{file_path}' não é uma máscara .bmask.")
+    if version != MASK_VERSION or bitorder_code >= len(_BIT_ORDERS):
+        raise ValueError(f"Versão ou ordem de bits não suportada em '{file_path}'.")
+    return height, width, _BIT_ORDERS[bitorder_code]
+
+def load_packed_mask(file_path: str, output: str = 'uint8',
+                     row_range: Union[Tuple[int, int], None] = None) -> np.ndarray:
+    """
+    Carrega uma máscara .bmask mapeando os bits empacotados em memória.
+
+    Nada é lido do disco além do cabeçalho até que os dados sejam usados, e com
+    `row_range` apenas as linhas pedidas são desempacotadas.
+
+    Args:
+        file_path: Caminho do arquivo.
+        output: 'packed' (np.memmap somente leitura dos bytes empacotados, sem cópia),
+                'bool' (visão booleana dos bits desempacotados) ou
+                'uint8' (0/255, o formato das outras funções de rotulação).
+        row_range: Intervalo opcional de linhas (início, fim) a carregar.
+
+    Returns:
+        Array NumPy com shape (linhas, largura), ou (linhas, ceil(largura / 8)) para 'packed'.
+
+    Raises:
+        ValueError: Se o arquivo for inválido ou `output` não for suportado.
+    """
+    if output not in ('packed', 'bool', 'uint8'):
+        raise ValueError(f"Saída não suportada: '{output}'. Use 'packed', 'bool' ou 'uint8'.")
+    height, width, bitorder = read_packed_mask_header(file_path)
+    row_bytes = (width + 7) // 8
+    if height == 0 or row_bytes == 0:
+        packed = np.zeros((height, row_bytes), dtype=np.uint8)
+    else:
+        packed = np.memmap(file_path, dtype=np.uint8, mode='r', offset=MASK_HEADER.size,
+                           shape=(height, row_bytes))
+    if row_range is not None:
+        packed = packed[row_range[0]:row_range[1]]
+    if output == 'packed':
+        return packed
+
+    bits = np.unpackbits(packed, axis=1, count=width, bitorder=bitorder)
+    if output == 'bool':
+        return bits.view(bool)
+    bits *= 255
+    return bits
+
+def convert_text_matrix_to_packed(text_path: str, output_path: str, bitorder: str = 'big') -> Tuple[int, int]:
+    """
+    Converte uma matriz de texto de '0'/'1' (de `save_array_as_text_matrix`) para .bmask.
+
+    O texto é lido de uma vez e os dígitos são separados dos espaços e quebras
+    de linha com operações sobre o array de bytes, sem analisar linha a linha.
+
+    Args:
+        text_path: Caminho da matriz de texto.
+        output_path: Caminho do .bmask a ser gravado.
+        bitorder: Ordem dos bits do arquivo gerado.
+
+    Returns:
+        Tupla (altura, largura) da máscara convertida.
+
+    Raises:
+        ValueError: Se as linhas não tiverem todas a mesma largura.
+    """
+    with open(text_path, 'rb') as text_file:
+        text = np.frombuffer(text_file.read(), dtype=np.uint8)
+    digits = text[(text == ord('0')) | (text == ord('1'))]
+    height = int(np.count_nonzero(text == ord('\n')))
+    if text.size and text[-1] != ord('\n'):
+        height += 1
+    if height == 0 or digits.size % height:
+        raise ValueError(f"Matriz de texto '{text_path}' com linhas de larguras diferentes.")
+    foreground = (digits == ord('1')).reshape(height, -1)
+    save_packed_mask(foreground, output_path, bitorder)
+    return foreground.shape
+
+# --- Bloco de Execução Principal ---
+
+if __name__ == '__main__':
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    text_matrix_path = os.path.join(script_dir, "rotulacao_matrix.txt")
+    packed_mask_path = os.path.join(script_dir, "rotulacao_matrix.bmask")
+
+    try:
+        shape = convert_text_matrix_to_packed(text_matrix_path, packed_mask_path)
+        print(f"Máscara {shape} convertida: {os.path.getsize(text_matrix_path)} bytes de texto -> "
+              f"{os.path.getsize(packed_mask_path)} bytes em '{packed_mask_path}'.")
+        mask = load_packed_mask(packed_mask_path)
+        print(f"Recarregada como {mask.dtype} {mask.shape}, {int(np.count_nonzero(mask))} pixels de objeto.")
+    except FileNotFoundError:
+        print(f"Erro: Arquivo não encontrado em '{text_matrix_path}'")
+    except ValueError as ve:
+        print(f"Erro de valor: {ve}")
@@ -2,7 +2,16 @@ import numpy as np
 from PIL import Image
 import matplotlib.pyplot as plt
 import os
-from typing import Tuple, Union, Dict, List, Any
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Tuple, Union, List, Iterable, Iterator
+
+from mascara_binaria import save_packed_mask
+
+# Binarização compartilhada com a pasta 6 (limiarização e morfologia)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '6'))
+from binarizacao import binarize_pil  # noqa: E402
 
 
 def load_image_pil(file_path: str) -> Union[Image.Image, None]:
@@ -37,12 +46,7 @@ def binarize_pil_image(image: Image.Image, threshold: int = 128) -> np.ndarray:
     Returns:
         Um array NumPy (uint8) com a imagem binarizada (valores 0 ou 255).
     """
-    if image.mode != 'L':
-        image_gray = image.convert('L')
-    else:
-        image_gray = image
-    binary_array = np.array(image_gray.point(lambda x: 0 if x < threshold else 255), dtype=np.uint8)
-    return binary_array
+    return binarize_pil(image, threshold)
 
 
 def save_numpy_as_image(image_array: np.ndarray, output_path: str) -> None:
@@ -65,6 +69,9 @@ def save_array_as_text_matrix(binary_array: np.ndarray, output_path: str) -> Non
     """
     Salva um array NumPy binário (0s e 255s) como uma matriz de '0's e '1's em um arquivo de texto.
 
+    Para armazenamento, prefira `save_packed_mask` (mascara_binaria.py): 1 bit por
+    pixel em vez de 2 bytes, e leitura mapeada em memória.
+
     Args:
         binary_array: O array NumPy binário (valores 0 ou 255).
         output_path: O caminho do arquivo de texto para salvar a matriz.
@@ -123,7 +130,123 @@ def plot_segmentation_results(original_pil: Image.Image,
     plt.show()
 
 
-def label_connected_components_dsu(binary_array: np.ndarray) -> Tuple[np.ndarray, int]:
+class UnionFind:
+    """
+    Union-find (Disjoint Set Union) sobre um array NumPy int32 pré-alocado.
+
+    `find` é iterativo com compressão por divisão pela metade (path halving),
+    então não há recursão mesmo em componentes longos em forma de serpente, e
+    `union` une por posto (rank), o que mantém as árvores rasas. `flatten`
+    resolve a raiz de todos os elementos de uma vez, com operações sobre o
+    array inteiro.
+
+    Atributos:
+        parents: Array int32 com o pai de cada elemento.
+        ranks: Array int8 com o posto (limite da altura) de cada raiz.
+        size: Número de elementos já criados (os índices válidos são 0..size-1).
+    """
+
+    def __init__(self, capacity: int, size: int = 0):
+        """
+        Args:
+            capacity: Número máximo de elementos.
+            size: Quantos elementos (0..size-1) já começam criados, cada um no seu conjunto.
+        """
+        self.parents = np.arange(capacity, dtype=np.int32)
+        self.ranks = np.zeros(capacity, dtype=np.int8)
+        self.size = size
+
+    def make_set(self) -> int:
+        """Cria um novo elemento em um conjunto próprio e retorna o seu índice."""
+        if self.size >= self.parents.size:
+            raise ValueError(f"Capacidade do union-find esgotada ({self.parents.size} elementos).")
+        element = self.size
+        self.size += 1
+        return element
+
+    def find(self, element: int) -> int:
+        """Retorna a raiz do conjunto de `element`, encurtando o caminho percorrido."""
+        parents = self.parents
+        parent = parents[element]
+        while parent != element:
+            grandparent = parents[parent]
+            parents[element] = grandparent
+            element, parent = grandparent, parents[grandparent]
+        return int(element)
+
+    def union(self, element_a: int, element_b: int) -> int:
+        """Une os conjuntos de `element_a` e `element_b` e retorna a raiz resultante."""
+        root_a, root_b = self.find(element_a), self.find(element_b)
+        if root_a == root_b:
+            return root_a
+        ranks = self.ranks
+        if ranks[root_a] < ranks[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parents[root_b] = root_a
+        if ranks[root_a] == ranks[root_b]:
+            ranks[root_a] += 1
+        return root_a
+
+    def union_pairs(self, elements_a: np.ndarray, elements_b: np.ndarray) -> None:
+        """
+        Une cada par (elements_a[i], elements_b[i]) com operações sobre o array inteiro.
+
+        A cada rodada, as raízes dos pares ainda separados são ligadas à menor das
+        duas (np.minimum.at, sem laço em Python) e as árvores são achatadas; os
+        pares já unidos saem da rodada seguinte. Ligar sempre à menor raiz nunca
+        forma ciclos, e o número de rodadas fica pequeno na prática.
+        """
+        elements_a = np.asarray(elements_a, dtype=np.int32)
+        elements_b = np.asarray(elements_b, dtype=np.int32)
+        while elements_a.size:
+            roots = self.flatten()
+            roots_a, roots_b = roots[elements_a], roots[elements_b]
+            separate = roots_a != roots_b
+            elements_a, elements_b = elements_a[separate], elements_b[separate]
+            roots_a, roots_b = roots_a[separate], roots_b[separate]
+            np.minimum.at(self.parents, np.maximum(roots_a, roots_b), np.minimum(roots_a, roots_b))
+
+    def flatten(self) -> np.ndarray:
+        """
+        Faz todos os elementos apontarem direto para a raiz e retorna as raízes.
+
+        Cada passo substitui o pai pelo avô em todo o array (pointer jumping);
+        como a união por posto limita a altura a log2(n), poucos passos bastam.
+
+        Returns:
+            Array int32 (size,) com a raiz de cada elemento (uma visão de `parents`).
+        """
+        roots = self.parents[:self.size]
+        while True:
+            grandparents = roots[roots]
+            if np.array_equal(grandparents, roots):
+                return roots
+            roots[:] = grandparents
+
+
+def labels_by_first_appearance(roots: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Numera as raízes 1, 2, ... na ordem da primeira posição em que aparecem.
+
+    Args:
+        roots: Raiz de cada elemento, com os elementos em ordem de varredura.
+
+    Returns:
+        Tupla (element_labels, num_labels): o rótulo sequencial de cada elemento
+        e o número de rótulos distintos.
+    """
+    unique_roots, first_positions = np.unique(roots, return_index=True)
+    root_to_label = np.zeros(int(unique_roots[-1]) + 1 if unique_roots.size else 0, dtype=np.int32)
+    root_to_label[unique_roots[np.argsort(first_positions)]] = np.arange(1, unique_roots.size + 1, dtype=np.int32)
+    return root_to_label[roots], int(unique_roots.size)
+
+def check_connectivity(connectivity: int) -> None:
+    """Valida o parâmetro de conectividade (4 ou 8)."""
+    if connectivity not in (4, 8):
+        raise ValueError(f"Conectividade deve ser 4 ou 8, recebido {connectivity}.")
+
+
+def label_connected_components_dsu(binary_array: np.ndarray, connectivity: int = 4) -> Tuple[np.ndarray, int]:
     """
     Rotula componentes conectados em uma imagem binária usando um algoritmo de duas passagens
     com Disjoint Set Union (DSU) para resolução de equivalências.
@@ -131,6 +254,8 @@ def label_connected_components_dsu(binary_array: np.ndarray) -> Tuple[np.ndarray
     Args:
         binary_array: Um array NumPy 2D representando a imagem binária,
                       onde pixels de objeto são 255 e fundo é 0.
+        connectivity: 4 (vizinhos norte e oeste) ou 8 (também as diagonais
+                      noroeste e nordeste).
 
     Returns:
         Tuple[np.ndarray, int]:
@@ -141,47 +266,34 @@ def label_connected_components_dsu(binary_array: np.ndarray) -> Tuple[np.ndarray
         Para aplicações mais robustas e otimizadas, considere usar bibliotecas como
         `scipy.ndimage.label`.
     """
+    check_connectivity(connectivity)
     rows, cols = binary_array.shape
     labeled_array = np.zeros_like(binary_array, dtype=np.int32)
     current_label_id = 0
-    # parents[i] armazena o pai do rótulo i. Rótulo 0 é fundo e não é usado aqui.
-    # Inicialmente, cada novo rótulo é seu próprio pai.
-    parents: List[int] = [0] # parents[0] é um placeholder
-
-    def find_set(label_id: int) -> int:
-        # Encontra o representante (raiz) do conjunto ao qual label_id pertence (com compressão de caminho).
-        if parents[label_id] == label_id:
-            return label_id
-        parents[label_id] = find_set(parents[label_id])
-        return parents[label_id]
-
-    def union_sets(label_id1: int, label_id2: int) -> None:
-        # Une os conjuntos que contêm label_id1 e label_id2.
-        root1 = find_set(label_id1)
-        root2 = find_set(label_id2)
-        if root1 != root2:
-            # Faz a raiz menor ser a pai da raiz maior para manter consistência (opcional, mas bom)
-            if root1 < root2:
-                parents[root2] = root1
-            else:
-                parents[root1] = root2
-    
+    # Rótulo 0 é fundo e não é usado. Cada rótulo provisório começa uma corrida
+    # nova (o vizinho oeste sempre é examinado), então há no máximo rows * ceil(cols / 2) deles.
+    label_sets = UnionFind(rows * ((cols + 1) // 2) + 1, size=1)
+
     # Primeira passagem: Atribuição inicial de rótulos e registro de equivalências
     for r in range(rows):
         for c in range(cols):
             if binary_array[r, c] == 255:  # Pixel de objeto
-                # Vizinhos relevantes (Norte e Oeste para conectividade-4)
+                # Vizinhos relevantes (Norte e Oeste para conectividade-4, mais Noroeste e Nordeste para 8)
                 neighbor_labels: List[int] = []
                 if r > 0 and labeled_array[r - 1, c] > 0: # Vizinho de cima
                     neighbor_labels.append(labeled_array[r - 1, c])
+                if connectivity == 8 and r > 0:
+                    if c > 0 and labeled_array[r - 1, c - 1] > 0: # Diagonal superior esquerda
+                        neighbor_labels.append(labeled_array[r - 1, c - 1])
+                    if c < cols - 1 and labeled_array[r - 1, c + 1] > 0: # Diagonal superior direita
+                        neighbor_labels.append(labeled_array[r - 1, c + 1])
                 if c > 0 and labeled_array[r, c - 1] > 0: # Vizinho da esquerda
                     neighbor_labels.append(labeled_array[r, c - 1])
                 
                 if not neighbor_labels:
                     # Novo componente
-                    current_label_id += 1
+                    current_label_id = label_sets.make_set()
                     labeled_array[r, c] = current_label_id
-                    parents.append(current_label_id) # Adiciona novo rótulo como seu próprio pai
                 else:
                     # Pixel conectado a componentes existentes
                     min_neighbor_label = min(neighbor_labels)
@@ -189,24 +301,793 @@ def label_connected_components_dsu(binary_array: np.ndarray) -> Tuple[np.ndarray
                     # Unir todos os rótulos vizinhos ao menor rótulo vizinho
                     for lbl in neighbor_labels:
                         if lbl != min_neighbor_label:
-                            union_sets(min_neighbor_label, lbl)
+                            label_sets.union(min_neighbor_label, lbl)
     
     # Segunda passagem: Resolver equivalências e re-rotular para rótulos sequenciais (1, 2, ...)
-    # Mapeia raízes de DSU para novos rótulos compactos (1, 2, ..., num_objects)
-    root_to_new_label: Dict[int, int] = {}
-    num_objects = 0
-    for r in range(rows):
-        for c in range(cols):
-            if labeled_array[r, c] > 0: # Se for um pixel de objeto rotulado
-                root = find_set(labeled_array[r, c])
-                if root not in root_to_new_label:
-                    num_objects += 1
-                    root_to_new_label[root] = num_objects
-                labeled_array[r, c] = root_to_new_label[root]
-                
+    # Os rótulos provisórios nascem em ordem de varredura, então numerar as raízes
+    # pela primeira aparição entre eles segue a ordem do primeiro pixel de cada objeto.
+    provisional_labels, num_objects = labels_by_first_appearance(label_sets.flatten()[1:])
+    label_lookup = np.concatenate(([0], provisional_labels)).astype(np.int32)
+    labeled_array = label_lookup[labeled_array]
+
     return labeled_array, num_objects
 
 
+def extract_foreground_runs(binary_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extrai as corridas horizontais de pixels de objeto (255) de cada linha.
+
+    As bordas das corridas são obtidas de uma vez para a imagem inteira: cada
+    linha recebe uma coluna de fundo de cada lado e a diferença entre colunas
+    vizinhas vale +1 no início de uma corrida e -1 logo após o seu fim.
+
+    Args:
+        binary_array: Array NumPy 2D binário (objeto = 255, fundo = 0).
+
+    Returns:
+        Tupla (run_rows, run_starts, run_ends) de arrays int64, em ordem de
+        varredura (linha a linha, da esquerda para a direita). run_ends é exclusivo.
+    """
+    rows = binary_array.shape[0]
+    padded = np.zeros((rows, binary_array.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = binary_array == 255
+    transitions = np.diff(padded, axis=1)
+    run_rows, run_starts = np.nonzero(transitions == 1)
+    _, run_ends = np.nonzero(transitions == -1)
+    return run_rows, run_starts, run_ends
+
+
+def find_overlapping_runs(run_rows: np.ndarray, run_starts: np.ndarray, run_ends: np.ndarray,
+                          row_stride: int, connectivity: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encontra os pares de corridas em linhas adjacentes que se tocam.
+
+    Cada corrida vira uma chave `linha * row_stride + coluna`, o que ordena todas
+    as corridas da imagem em um único eixo. Para cada corrida, duas buscas
+    binárias na linha de cima dão o intervalo de corridas que se sobrepõem a ela.
+    Com conectividade-8, a corrida é alargada em uma coluna de cada lado antes
+    das buscas, o que inclui as que só se tocam na diagonal, sem custo extra.
+
+    Args:
+        run_rows, run_starts, run_ends: Corridas de `extract_foreground_runs`.
+        row_stride: Maior que qualquer coluna de fim mais um (ex.: largura + 2),
+                    para que as chaves de linhas diferentes não se misturem.
+        connectivity: 4 ou 8.
+
+    Returns:
+        Tupla (upper_runs, lower_runs) com os índices das corridas de cada par.
+    """
+    start_keys = run_rows * row_stride + run_starts
+    end_keys = run_rows * row_stride + run_ends
+    upper_row_offset = (run_rows - 1) * row_stride
+    margin = 1 if connectivity == 8 else 0
+    # Corridas da linha de cima com fim > início e início < fim desta corrida (alargada pela margem)
+    first_overlap = np.searchsorted(end_keys, upper_row_offset + run_starts - margin, side='right')
+    last_overlap = np.searchsorted(start_keys, upper_row_offset + run_ends + margin, side='left')
+    overlap_counts = np.maximum(last_overlap - first_overlap, 0)
+
+    lower_runs = np.repeat(np.arange(run_rows.size), overlap_counts)
+    pair_offsets = np.arange(lower_runs.size) - np.repeat(np.cumsum(overlap_counts) - overlap_counts, overlap_counts)
+    upper_runs = np.repeat(first_overlap, overlap_counts) + pair_offsets
+    return upper_runs, lower_runs
+
+
+def label_connected_components_runs(binary_array: np.ndarray, connectivity: int = 4) -> Tuple[np.ndarray, int]:
+    """
+    Rotula componentes conectados trabalhando com corridas de pixels.
+
+    Em vez de visitar cada pixel, a imagem é reduzida às suas corridas horizontais
+    de objeto; as equivalências vêm dos pares de corridas sobrepostas em linhas
+    adjacentes e são resolvidas com union-find sobre as corridas. Os rótulos
+    finais são atribuídos em ordem de primeira aparição na varredura e pintados
+    com uma única consulta a tabela, então o resultado (rótulos e número de
+    objetos) é idêntico ao de `label_connected_components_dsu`.
+
+    Args:
+        binary_array: Um array NumPy 2D representando a imagem binária,
+                      onde pixels de objeto são 255 e fundo é 0.
+        connectivity: 4 ou 8 (diagonais conectam). O custo é o mesmo nos dois casos.
+
+    Returns:
+        Tuple[np.ndarray, int]:
+            - Um array NumPy 2D (int32) com os componentes rotulados (rótulos > 0).
+            - O número de objetos (componentes conectados) encontrados.
+    """
+    check_connectivity(connectivity)
+    rows, cols = binary_array.shape
+    labeled_array = np.zeros((rows, cols), dtype=np.int32)
+    run_rows, run_starts, run_ends = extract_foreground_runs(binary_array)
+    num_runs = run_rows.size
+    if num_runs == 0:
+        return labeled_array, 0
+
+    upper_runs, lower_runs = find_overlapping_runs(run_rows, run_starts, run_ends, cols + 2, connectivity)
+
+    run_sets = UnionFind(num_runs, size=num_runs)
+    run_sets.union_pairs(upper_runs, lower_runs)
+    # Corridas estão em ordem de varredura: a primeira de cada objeto é a que contém o seu primeiro pixel
+    run_labels, num_objects = labels_by_first_appearance(run_sets.flatten())
+
+    labeled_array.ravel()[np.flatnonzero(binary_array == 255)] = np.repeat(run_labels, run_ends - run_starts)
+    return labeled_array, num_objects
+
+
+
+def _label_tile(mask_name: str, labels_name: str, shape: Tuple[int, int],
+                row_start: int, row_end: int, connectivity: int) -> int:
+    # Executada em um processo do pool: anexa a memória compartilhada, rotula a
+    # faixa [row_start, row_end) com rótulos locais 1..n e os escreve no lugar.
+    mask_memory = shared_memory.SharedMemory(name=mask_name)
+    labels_memory = shared_memory.SharedMemory(name=labels_name)
+    try:
+        mask = np.ndarray(shape, dtype=np.uint8, buffer=mask_memory.buf)
+        labels = np.ndarray(shape, dtype=np.int32, buffer=labels_memory.buf)
+        tile_labels, num_tile_objects = label_connected_components_runs(mask[row_start:row_end], connectivity)
+        labels[row_start:row_end] = tile_labels
+        del mask, labels
+        return num_tile_objects
+    finally:
+        mask_memory.close()
+        labels_memory.close()
+
+
+def find_seam_label_pairs(upper_row: np.ndarray, lower_row: np.ndarray,
+                          connectivity: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Retorna os pares de rótulos que se tocam através da costura entre duas linhas.
+
+    Args:
+        upper_row: Última linha de rótulos de uma faixa (rótulos globais, 0 = fundo).
+        lower_row: Primeira linha de rótulos da faixa seguinte.
+        connectivity: 4 (só o vizinho vertical) ou 8 (também as diagonais).
+
+    Returns:
+        Tupla (upper_labels, lower_labels) com um par por contato.
+    """
+    offsets = [(slice(None), slice(None))]
+    if connectivity == 8:
+        offsets += [(slice(None, -1), slice(1, None)), (slice(1, None), slice(None, -1))]
+    upper_labels, lower_labels = [], []
+    for upper_slice, lower_slice in offsets:
+        upper, lower = upper_row[upper_slice], lower_row[lower_slice]
+        touching = (upper > 0) & (lower > 0)
+        upper_labels.append(upper[touching])
+        lower_labels.append(lower[touching])
+    return np.concatenate(upper_labels), np.concatenate(lower_labels)
+
+
+def label_connected_components_tiled(binary_array: np.ndarray, connectivity: int = 4,
+                                     workers: Union[int, None] = None,
+                                     tile_rows: Union[int, None] = None) -> Tuple[np.ndarray, int]:
+    """
+    Rotula componentes conectados dividindo a imagem em faixas rotuladas em paralelo.
+
+    A máscara é copiada uma vez para um bloco de `multiprocessing.shared_memory`,
+    e cada faixa horizontal é rotulada por `label_connected_components_runs` em um
+    processo do pool, escrevendo rótulos locais em um segundo bloco compartilhado.
+    Depois, no processo principal:
+    1. os rótulos de cada faixa são deslocados pela soma das contagens das
+       faixas anteriores, o que os torna únicos na imagem;
+    2. só os pares de pixels que se tocam através das costuras entre faixas
+       são unidos com union-find;
+    3. cada objeto é representado pelo seu menor rótulo deslocado, e os
+       objetos são renumerados 1, 2, ... nessa ordem com uma tabela por faixa.
+
+    Os rótulos locais seguem a ordem de varredura dentro de cada faixa, e as
+    faixas estão em ordem, então o menor rótulo de um objeto é o do seu primeiro
+    pixel: o resultado é idêntico ao de `label_connected_components_runs`.
+
+    Args:
+        binary_array: Array NumPy 2D binário (objeto = 255, fundo = 0).
+        connectivity: 4 ou 8.
+        workers: Número de processos (padrão: os.cpu_count()).
+        tile_rows: Linhas por faixa (padrão: a imagem dividida igualmente entre os processos).
+
+    Returns:
+        Tuple[np.ndarray, int]: rótulos (int32) e número de objetos.
+    """
+    check_connectivity(connectivity)
+    rows, cols = binary_array.shape
+    workers = workers or os.cpu_count() or 1
+    tile_rows = tile_rows or -(-rows // workers)
+    tile_starts = list(range(0, rows, max(1, tile_rows)))
+    if len(tile_starts) <= 1:
+        return label_connected_components_runs(binary_array, connectivity)
+    tile_ends = tile_starts[1:] + [rows]
+
+    mask_memory = shared_memory.SharedMemory(create=True, size=max(1, rows * cols))
+    labels_memory = shared_memory.SharedMemory(create=True, size=max(1, rows * cols * 4))
+    try:
+        mask = np.ndarray((rows, cols), dtype=np.uint8, buffer=mask_memory.buf)
+        mask[...] = binary_array
+        tile_labels = np.ndarray((rows, cols), dtype=np.int32, buffer=labels_memory.buf)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tile_counts = list(executor.map(
+                _label_tile, [mask_memory.name] * len(tile_starts), [labels_memory.name] * len(tile_starts),
+                [(rows, cols)] * len(tile_starts), tile_starts, tile_ends, [connectivity] * len(tile_starts)))
+        tile_offsets = np.concatenate(([0], np.cumsum(tile_counts)))
+        total_labels = int(tile_offsets[-1])
+
+        # Uniões apenas através das costuras, com rótulos já deslocados
+        seam_upper, seam_lower = [], []
+        for tile, seam_row in enumerate(tile_starts[1:], start=1):
+            upper_row = tile_labels[seam_row - 1] + np.where(tile_labels[seam_row - 1] > 0, tile_offsets[tile - 1], 0)
+            lower_row = tile_labels[seam_row] + np.where(tile_labels[seam_row] > 0, tile_offsets[tile], 0)
+            upper_labels, lower_labels = find_seam_label_pairs(upper_row, lower_row, connectivity)
+            seam_upper.append(upper_labels)
+            seam_lower.append(lower_labels)
+        seam_upper, seam_lower = np.concatenate(seam_upper), np.concatenate(seam_lower)
+
+        # Cada rótulo passa a apontar para o menor rótulo do seu objeto
+        canonical = np.arange(total_labels + 1, dtype=np.int64)
+        if seam_upper.size:
+            seam_ids, dense_pairs = np.unique(np.concatenate((seam_upper, seam_lower)), return_inverse=True)
+            seam_sets = UnionFind(seam_ids.size, size=seam_ids.size)
+            seam_sets.union_pairs(dense_pairs[:seam_upper.size], dense_pairs[seam_upper.size:])
+            dense_roots = seam_sets.flatten()
+            smallest_id = np.full(seam_ids.size, total_labels + 1, dtype=np.int64)
+            np.minimum.at(smallest_id, dense_roots, seam_ids)
+            canonical[seam_ids] = smallest_id[dense_roots]
+
+        is_representative = canonical == np.arange(total_labels + 1)
+        is_representative[0] = False
+        final_labels = np.cumsum(is_representative).astype(np.int32)[canonical]
+        num_objects = int(is_representative.sum())
+
+        labeled_array = np.empty((rows, cols), dtype=np.int32)
+        for tile, (row_start, row_end) in enumerate(zip(tile_starts, tile_ends)):
+            tile_lookup = final_labels[tile_offsets[tile]:tile_offsets[tile + 1] + 1].copy()
+            tile_lookup[0] = 0
+            labeled_array[row_start:row_end] = tile_lookup[tile_labels[row_start:row_end]]
+        del mask, tile_labels
+        return labeled_array, num_objects
+    finally:
+        mask_memory.close()
+        mask_memory.unlink()
+        labels_memory.close()
+        labels_memory.unlink()
+
+
+def remove_small_objects(labeled_array: np.ndarray, min_area: int) -> Tuple[np.ndarray, int]:
+    """
+    Remove os objetos com menos de `min_area` pixels e renumera os restantes.
+
+    As áreas saem de um único np.bincount sobre a imagem de rótulos; uma tabela
+    leva cada rótulo mantido ao seu novo número (na mesma ordem) e os removidos
+    a 0, e é aplicada com uma única indexação. Não há laço por objeto.
+
+    Args:
+        labeled_array: Array 2D de rótulos (0 = fundo), como os dos rotuladores.
+        min_area: Área mínima, em pixels, para um objeto ser mantido.
+
+    Returns:
+        Tuple[np.ndarray, int]: rótulos renumerados (int32) e número de objetos mantidos.
+    """
+    areas = np.bincount(labeled_array.ravel())
+    keep = areas >= min_area
+    keep[0] = False
+    label_lookup = np.cumsum(keep).astype(np.int32)
+    label_lookup[~keep] = 0
+    return label_lookup[labeled_array], int(keep.sum())
+
+
+def fill_holes(binary_array: np.ndarray, connectivity: int = 4) -> np.ndarray:
+    """
+    Preenche os buracos dos objetos: regiões de fundo que não alcançam a borda da imagem.
+
+    O fundo é rotulado como se fosse objeto (com `label_connected_components_runs`);
+    os rótulos presentes na borda são o fundo "de fora" e todos os outros viram
+    objeto, com uma tabela aplicada de uma vez. O custo é linear no número de pixels.
+
+    Args:
+        binary_array: Array NumPy 2D binário (objeto = 255, fundo = 0).
+        connectivity: Conectividade usada para o fundo (4 ou 8).
+
+    Returns:
+        Array NumPy 2D uint8 (0/255) com os buracos preenchidos.
+    """
+    background = np.where(binary_array == 255, 0, 255).astype(np.uint8)
+    background_labels, num_regions = label_connected_components_runs(background, connectivity)
+
+    is_hole = np.ones(num_regions + 1, dtype=bool)
+    is_hole[0] = False
+    for border in (background_labels[0], background_labels[-1], background_labels[:, 0], background_labels[:, -1]):
+        is_hole[border] = False
+    return np.where((binary_array == 255) | is_hole[background_labels], 255, 0).astype(np.uint8)
+
+
+def narrowest_label_dtype(max_value: int) -> np.dtype:
+    """Retorna o menor tipo sem sinal (uint8, uint16 ou uint32) que comporta `max_value`."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"Valor {max_value} não cabe em 32 bits sem sinal.")
+
+
+class LabelMap:
+    """
+    Imagem de rótulos compacta: tipo mais estreito possível e, opcionalmente, corridas.
+
+    No modo denso os rótulos ficam em um array (H, W) de uint8, uint16 ou uint32,
+    conforme o maior rótulo, em vez de sempre int32. O tipo vem dos próprios
+    rótulos, e não do número de objetos, porque os rótulos podem não ser
+    contíguos (ex.: os de IncrementalLabeler). No modo de corridas
+    só ficam as corridas horizontais de cada rótulo, como registros
+    (row, start, end, label) com `end` exclusivo, ordenados por rótulo e, dentro
+    de cada rótulo, em ordem de varredura; `label_offsets[k]` indica onde
+    começam as corridas do rótulo k. Assim a caixa e a máscara de um objeto
+    saem só das corridas dele, em O(corridas do objeto).
+
+    A conversão entre os modos e de volta para o array denso é sem perdas.
+
+    Atributos:
+        shape: Shape (H, W) da imagem.
+        num_objects: Número de objetos presentes.
+        max_label: Maior rótulo presente (igual a num_objects se forem 1..num_objects).
+        dtype: Tipo dos rótulos, o mais estreito que comporta max_label.
+        dense: Array denso (modo denso) ou None.
+        runs: Array estruturado de corridas (modo de corridas) ou None.
+        label_offsets: Início das corridas de cada rótulo (max_label + 2 posições) ou None.
+    """
+
+    def __init__(self, shape: Tuple[int, int], num_objects: int,
+                 max_label: Union[int, None] = None,
+                 dense: Union[np.ndarray, None] = None,
+                 runs: Union[np.ndarray, None] = None,
+                 label_offsets: Union[np.ndarray, None] = None):
+        self.shape = tuple(shape)
+        self.num_objects = int(num_objects)
+        self.max_label = self.num_objects if max_label is None else int(max_label)
+        self.dtype = narrowest_label_dtype(self.max_label)
+        self.dense = dense
+        self.runs = runs
+        self.label_offsets = label_offsets
+
+    @classmethod
+    def from_dense(cls, labeled_array: np.ndarray, num_objects: Union[int, None] = None,
+                   run_length: bool = False) -> 'LabelMap':
+        """
+        Cria um LabelMap a partir de uma imagem de rótulos (ex.: saída dos rotuladores).
+
+        Args:
+            labeled_array: Array 2D de rótulos inteiros (0 = fundo).
+            num_objects: Número de objetos (padrão: contado a partir dos rótulos).
+                         Não afeta o tipo nem o armazenamento.
+            run_length: Se True, guarda corridas em vez do array denso.
+
+        Returns:
+            O LabelMap correspondente.
+
+        Raises:
+            ValueError: Se houver rótulos negativos.
+        """
+        max_label = int(labeled_array.max()) if labeled_array.size else 0
+        if labeled_array.size and labeled_array.min() < 0:
+            raise ValueError("Os rótulos devem ser inteiros não negativos.")
+        if num_objects is None:
+            num_objects = int(np.count_nonzero(np.bincount(labeled_array.ravel(), minlength=1)[1:]))
+        label_map = cls(labeled_array.shape, num_objects, max_label)
+        if not run_length:
+            label_map.dense = labeled_array.astype(label_map.dtype)
+            return label_map
+
+        rows, cols = labeled_array.shape
+        # Fronteiras onde o rótulo muda, com fundo de cada lado de cada linha;
+        # cada fronteira com rótulo != 0 começa uma corrida que termina na fronteira seguinte
+        padded = np.zeros((rows, cols + 2), dtype=labeled_array.dtype)
+        padded[:, 1:-1] = labeled_array
+        boundary_rows, boundary_cols = np.nonzero(padded[:, 1:] != padded[:, :-1])
+        boundary_labels = padded[boundary_rows, boundary_cols + 1]
+        starts_run = np.flatnonzero(boundary_labels)
+
+        coordinate_dtype = narrowest_label_dtype(max(rows, cols))
+        runs = np.empty(starts_run.size, dtype=[('row', coordinate_dtype), ('start', coordinate_dtype),
+                                                 ('end', coordinate_dtype), ('label', label_map.dtype)])
+        order = np.argsort(boundary_labels[starts_run], kind='stable')
+        runs['row'] = boundary_rows[starts_run][order]
+        runs['start'] = boundary_cols[starts_run][order]
+        runs['end'] = boundary_cols[starts_run + 1][order]
+        runs['label'] = boundary_labels[starts_run][order]
+
+        label_map.runs = runs
+        label_map.label_offsets = np.searchsorted(runs['label'], np.arange(max_label + 2)).astype(np.int64)
+        return label_map
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados pelos dados de rótulos."""
+        if self.runs is not None:
+            return self.runs.nbytes + self.label_offsets.nbytes
+        return self.dense.nbytes
+
+    def to_dense(self) -> np.ndarray:
+        """Retorna a imagem de rótulos densa (H, W), no tipo estreito do mapa."""
+        if self.dense is not None:
+            return self.dense
+        dense = np.zeros(self.shape, dtype=self.dtype)
+        lengths = self.runs['end'].astype(np.int64) - self.runs['start']
+        if lengths.size:
+            # Índice linear de cada pixel de cada corrida: início da corrida + deslocamento dentro dela
+            run_first_pixel = self.runs['row'].astype(np.int64) * self.shape[1] + self.runs['start']
+            offsets_in_run = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            dense.ravel()[np.repeat(run_first_pixel, lengths) + offsets_in_run] = np.repeat(self.runs['label'], lengths)
+        return dense
+
+    def to_run_length(self) -> 'LabelMap':
+        """Retorna o mesmo mapa no modo de corridas."""
+        if self.runs is not None:
+            return self
+        return LabelMap.from_dense(self.dense, self.num_objects, run_length=True)
+
+    def component_runs(self, label: int) -> np.ndarray:
+        """Retorna as corridas do objeto `label` (modo de corridas), sem cópia."""
+        if not 0 < label <= self.max_label:
+            return self.runs[:0]
+        return self.runs[self.label_offsets[label]:self.label_offsets[label + 1]]
+
+    def component_bbox(self, label: int) -> Tuple[int, int, int, int]:
+        """
+        Retorna a caixa do objeto como (min_row, min_col, max_row, max_col), com fim exclusivo.
+
+        Raises:
+            ValueError: Se o rótulo não existir na imagem.
+        """
+        if self.runs is None:
+            object_rows, object_cols = np.nonzero(self.dense == label)
+            if object_rows.size == 0:
+                raise ValueError(f"Rótulo {label} não está presente.")
+            return (int(object_rows.min()), int(object_cols.min()),
+                    int(object_rows.max()) + 1, int(object_cols.max()) + 1)
+        runs = self.component_runs(label)
+        if runs.size == 0:
+            raise ValueError(f"Rótulo {label} não está presente.")
+        # As corridas de um rótulo estão em ordem de varredura: linhas já ordenadas
+        return int(runs['row'][0]), int(runs['start'].min()), int(runs['row'][-1]) + 1, int(runs['end'].max())
+
+    def component_mask(self, label: int) -> Tuple[Tuple[int, int, int, int], np.ndarray]:
+        """
+        Retorna a máscara booleana do objeto recortada na sua caixa.
+
+        Returns:
+            Tupla (caixa, máscara), com a caixa como em `component_bbox`.
+        """
+        bbox = self.component_bbox(label)
+        min_row, min_col, max_row, max_col = bbox
+        if self.runs is None:
+            return bbox, self.dense[min_row:max_row, min_col:max_col] == label
+        mask = np.zeros((max_row - min_row, max_col - min_col), dtype=bool)
+        for row, start, end, _ in self.component_runs(label).tolist():
+            mask[row - min_row, start - min_col:end - min_col] = True
+        return bbox, mask
+
+# Campos de `region_properties`; as caixas seguem a convenção de fatias (fim exclusivo)
+REGION_PROPERTIES_DTYPE = np.dtype([
+    ('label', np.int32),
+    ('area', np.int64),
+    ('min_row', np.int32), ('min_col', np.int32),
+    ('max_row', np.int32), ('max_col', np.int32),
+    ('centroid_row', np.float64), ('centroid_col', np.float64),
+    ('mean_intensity', np.float64),
+    ('perimeter', np.int64),
+])
+
+
+def region_properties(labeled_array: np.ndarray, num_objects: int,
+                      intensity_array: Union[np.ndarray, None] = None) -> np.ndarray:
+    """
+    Calcula as propriedades de todos os objetos rotulados em uma única passagem.
+
+    Cada propriedade é um acúmulo por rótulo sobre os pixels de objeto
+    (np.bincount para contagens e somas, np.minimum.at / np.maximum.at para a
+    caixa delimitadora), então o custo é O(pixels), independente do número de
+    objetos.
+
+    O perímetro é o número de arestas de pixel expostas: lados de um pixel do
+    objeto cujo vizinho (conectividade-4) é de outro rótulo, do fundo ou fica
+    fora da imagem.
+
+    Args:
+        labeled_array: Array 2D de rótulos (0 = fundo, 1..num_objects = objetos).
+        num_objects: Número de objetos.
+        intensity_array: Imagem opcional com o mesmo shape, para a intensidade
+                         média de cada objeto (NaN quando não informada).
+
+    Returns:
+        Array estruturado (num_objects,) com dtype REGION_PROPERTIES_DTYPE, um
+        registro por rótulo, em ordem de rótulo.
+    """
+    rows, cols = labeled_array.shape
+    properties = np.zeros(num_objects, dtype=REGION_PROPERTIES_DTYPE)
+    properties['label'] = np.arange(1, num_objects + 1)
+    if num_objects == 0:
+        return properties
+
+    flat_labels = labeled_array.ravel()
+    pixel_indices = np.flatnonzero(flat_labels)
+    pixel_labels = flat_labels[pixel_indices]
+    pixel_rows, pixel_cols = np.divmod(pixel_indices, cols)
+    bins = num_objects + 1
+
+    area = np.bincount(pixel_labels, minlength=bins)
+    properties['area'] = area[1:]
+    properties['centroid_row'] = np.bincount(pixel_labels, weights=pixel_rows, minlength=bins)[1:] / area[1:]
+    properties['centroid_col'] = np.bincount(pixel_labels, weights=pixel_cols, minlength=bins)[1:] / area[1:]
+
+    min_row = np.full(bins, rows, dtype=np.int64)
+    min_col = np.full(bins, cols, dtype=np.int64)
+    max_row = np.full(bins, -1, dtype=np.int64)
+    max_col = np.full(bins, -1, dtype=np.int64)
+    np.minimum.at(min_row, pixel_labels, pixel_rows)
+    np.minimum.at(min_col, pixel_labels, pixel_cols)
+    np.maximum.at(max_row, pixel_labels, pixel_rows)
+    np.maximum.at(max_col, pixel_labels, pixel_cols)
+    properties['min_row'], properties['min_col'] = min_row[1:], min_col[1:]
+    properties['max_row'], properties['max_col'] = max_row[1:] + 1, max_col[1:] + 1
+
+    if intensity_array is None:
+        properties['mean_intensity'] = np.nan
+    else:
+        intensity_sums = np.bincount(pixel_labels, weights=intensity_array.ravel()[pixel_indices], minlength=bins)
+        properties['mean_intensity'] = intensity_sums[1:] / area[1:]
+
+    # Arestas expostas: compara cada pixel com os quatro vizinhos (fora da imagem = fundo)
+    padded = np.pad(labeled_array, 1)
+    center = padded[1:-1, 1:-1]
+    perimeter = np.zeros(bins, dtype=np.int64)
+    for neighbor in (padded[:-2, 1:-1], padded[2:, 1:-1], padded[1:-1, :-2], padded[1:-1, 2:]):
+        exposed = center[(center != neighbor) & (center > 0)]
+        perimeter += np.bincount(exposed, minlength=bins)
+    properties['perimeter'] = perimeter[1:]
+    return properties
+
+
+def label_connected_components_streaming(mask_rows: Iterable[np.ndarray],
+                                         connectivity: int = 4) -> Iterator[np.void]:
+    """
+    Rotula uma máscara linha a linha e emite as propriedades de cada objeto assim que ele se fecha.
+
+    Só as corridas da linha anterior e a tabela de objetos ainda abertos ficam
+    em memória; nem a máscara nem a imagem de rótulos são guardadas. A cada
+    linha, as corridas novas são ligadas às corridas de cima (como em
+    `label_connected_components_runs`) com um union-find pequeno sobre
+    "objetos abertos + corridas da linha", o que também junta objetos que se
+    encontram nessa linha. Um objeto aberto que não toca nenhuma corrida nova
+    não pode mais crescer e é emitido na hora; os restantes são emitidos ao
+    fim da entrada. A memória é O(largura + objetos abertos).
+
+    Os registros têm o dtype de `region_properties`, com `mean_intensity` NaN e
+    o perímetro também contado em arestas expostas. Como um objeto só é
+    conhecido por inteiro quando se fecha, `label` é a ordem de emissão
+    (1, 2, ...), e não a ordem de varredura usada pelos rotuladores em lote.
+
+    Args:
+        mask_rows: Iterável de linhas 1D da máscara, todas com a mesma largura
+                   (objeto = 255, ou True para linhas booleanas).
+        connectivity: 4 ou 8.
+
+    Yields:
+        Um registro REGION_PROPERTIES_DTYPE por objeto.
+    """
+    check_connectivity(connectivity)
+    # Objetos abertos; os campos de centroide acumulam somas até a emissão
+    open_objects = np.zeros(0, dtype=REGION_PROPERTIES_DTYPE)
+    previous_starts = previous_ends = np.zeros(0, dtype=np.int64)
+    previous_objects = np.zeros(0, dtype=np.int64)
+    emitted = 0
+
+    def close(objects: np.ndarray) -> Iterator[np.void]:
+        nonlocal emitted
+        objects['label'] = np.arange(emitted + 1, emitted + 1 + objects.size)
+        objects['centroid_row'] /= objects['area']
+        objects['centroid_col'] /= objects['area']
+        objects['mean_intensity'] = np.nan
+        emitted += objects.size
+        yield from objects
+
+    row = -1
+    for row, mask_row in enumerate(mask_rows):
+        mask_row = np.asarray(mask_row)
+        foreground = mask_row if mask_row.dtype == bool else mask_row == 255
+        _, starts, ends = extract_foreground_runs(np.where(foreground, 255, 0)[np.newaxis])
+        lengths = ends - starts
+        num_open, num_runs = open_objects.size, starts.size
+
+        # Pares (corrida de cima, corrida nova) e sobreposição vertical de cada par
+        upper_runs, lower_runs = find_overlapping_runs(
+            np.repeat([0, 1], [previous_starts.size, num_runs]),
+            np.concatenate((previous_starts, starts)), np.concatenate((previous_ends, ends)),
+            mask_row.size + 2, connectivity)
+        lower_runs -= previous_starts.size
+        vertical_overlap = np.maximum(np.minimum(previous_ends[upper_runs], ends[lower_runs])
+                                      - np.maximum(previous_starts[upper_runs], starts[lower_runs]), 0)
+
+        # Nós: objetos abertos 0..num_open-1, corridas novas num_open..num_open+num_runs-1
+        node_sets = UnionFind(num_open + num_runs, size=num_open + num_runs)
+        node_sets.union_pairs(previous_objects[upper_runs], num_open + lower_runs)
+        roots = node_sets.flatten().astype(np.int64)
+        bins = num_open + num_runs
+
+        # Perímetro: laterais das corridas, topo não coberto das novas e base não coberta das de cima
+        covered_top = np.bincount(lower_runs, weights=vertical_overlap, minlength=num_runs)
+        covered_bottom = np.bincount(upper_runs, weights=vertical_overlap, minlength=previous_starts.size)
+        run_perimeter = 2 + lengths - covered_top
+        open_perimeter = open_objects['perimeter'] + np.bincount(
+            previous_objects, weights=(previous_ends - previous_starts) - covered_bottom, minlength=num_open)
+
+        node_area = np.concatenate((open_objects['area'], lengths))
+        node_row_sum = np.concatenate((open_objects['centroid_row'], lengths * float(row)))
+        node_col_sum = np.concatenate((open_objects['centroid_col'], (starts + ends - 1) * lengths / 2))
+        node_perimeter = np.concatenate((open_perimeter, run_perimeter))
+        node_min_row = np.concatenate((open_objects['min_row'], np.full(num_runs, row)))
+        node_max_row = np.concatenate((open_objects['max_row'], np.full(num_runs, row + 1)))
+        node_min_col = np.concatenate((open_objects['min_col'], starts))
+        node_max_col = np.concatenate((open_objects['max_col'], ends))
+
+        merged = np.zeros(bins, dtype=REGION_PROPERTIES_DTYPE)
+        merged['area'] = np.bincount(roots, weights=node_area, minlength=bins)
+        merged['centroid_row'] = np.bincount(roots, weights=node_row_sum, minlength=bins)
+        merged['centroid_col'] = np.bincount(roots, weights=node_col_sum, minlength=bins)
+        merged['perimeter'] = np.bincount(roots, weights=node_perimeter, minlength=bins)
+        for field, values, reduce in (('min_row', node_min_row, np.minimum), ('min_col', node_min_col, np.minimum),
+                                      ('max_row', node_max_row, np.maximum), ('max_col', node_max_col, np.maximum)):
+            merged[field] = values
+            reduce.at(merged[field], roots, values)
+
+        # Conjuntos sem corrida nova se fecharam; os demais continuam abertos
+        has_run = np.zeros(bins, dtype=bool)
+        has_run[roots[num_open:]] = True
+        is_root = roots == np.arange(bins)
+        yield from close(merged[is_root & ~has_run])
+
+        still_open = np.flatnonzero(is_root & has_run)
+        root_to_open = np.zeros(bins, dtype=np.int64)
+        root_to_open[still_open] = np.arange(still_open.size)
+        open_objects = merged[still_open]
+        previous_starts, previous_ends = starts, ends
+        previous_objects = root_to_open[roots[num_open:]]
+
+    # Fim da entrada: a base da última linha fica exposta
+    open_objects['perimeter'] += np.bincount(previous_objects, weights=previous_ends - previous_starts,
+                                             minlength=open_objects.size).astype(np.int64)
+    yield from close(open_objects)
+
+
+class IncrementalLabeler:
+    """
+    Rotulador para sequências de quadros que só re-rotula a região que mudou.
+
+    O primeiro quadro é rotulado inteiro. Nos seguintes, a caixa dos pixels
+    alterados ganha uma borda de 1 pixel (halo); os objetos anteriores que
+    aparecem nessa região são os únicos que podem ter crescido, encolhido,
+    se dividido ou se unido. A janela re-rotulada é a união da região com as
+    caixas (em cache) desses objetos, e dentro dela só entram os pixels da
+    região e os desses objetos: os demais objetos não mudam.
+
+    Fora da região nada mudou e o halo não mudou, então um caminho entre um
+    pixel de fora e um objeto novo passa por um pixel do halo com o mesmo
+    rótulo anterior: todo objeto novo que toca a região fica dentro da janela.
+
+    Os rótulos são estáveis entre quadros: cada objeto novo herda o rótulo do
+    objeto anterior com que tem a maior sobreposição (pares tratados em ordem
+    decrescente de sobreposição, cada rótulo usado uma vez). Partes de uma
+    divisão que não herdam rótulo, e objetos novos, recebem rótulos novos, e
+    rótulos de objetos que sumiram não são reaproveitados. Por isso os rótulos
+    não são contíguos: use `max_label` como `num_objects` em `region_properties`.
+
+    Atributos:
+        connectivity: 4 ou 8.
+        labels: Rótulos (int32) do último quadro, ou None antes do primeiro.
+        max_label: Maior rótulo já atribuído.
+    """
+
+    def __init__(self, connectivity: int = 4):
+        check_connectivity(connectivity)
+        self.connectivity = connectivity
+        self.labels: Union[np.ndarray, None] = None
+        self.max_label = 0
+        # Caixa de cada rótulo (min_row, min_col, max_row, max_col), fim exclusivo; vazia se o rótulo não existe
+        self._bboxes = np.zeros((1, 4), dtype=np.int64)
+
+    @property
+    def num_objects(self) -> int:
+        """Número de objetos presentes no último quadro."""
+        return int(np.count_nonzero(self._bboxes[1:self.max_label + 1, 2]))
+
+    def _set_bboxes(self, labels: np.ndarray, row_offset: int, col_offset: int, ids: np.ndarray) -> None:
+        """Atualiza o cache de caixas com as caixas de `labels` (rótulos locais 1..) mapeados por `ids`."""
+        if self.max_label >= self._bboxes.shape[0]:
+            grown = np.zeros((max(self.max_label + 1, 2 * self._bboxes.shape[0]), 4), dtype=np.int64)
+            grown[:self._bboxes.shape[0]] = self._bboxes
+            self._bboxes = grown
+        bins = ids.size
+        pixel_rows, pixel_cols = np.nonzero(labels)
+        pixel_labels = labels[pixel_rows, pixel_cols]
+        bboxes = np.empty((bins, 4), dtype=np.int64)
+        bboxes[:, :2] = np.iinfo(np.int64).max
+        bboxes[:, 2:] = -1
+        np.minimum.at(bboxes[:, 0], pixel_labels, pixel_rows)
+        np.minimum.at(bboxes[:, 1], pixel_labels, pixel_cols)
+        np.maximum.at(bboxes[:, 2], pixel_labels, pixel_rows)
+        np.maximum.at(bboxes[:, 3], pixel_labels, pixel_cols)
+        bboxes += (row_offset, col_offset, row_offset + 1, col_offset + 1)
+        self._bboxes[ids[1:]] = bboxes[1:]
+
+    def update(self, binary_array: np.ndarray,
+               change_mask: Union[np.ndarray, None] = None) -> Tuple[np.ndarray, int]:
+        """
+        Rotula o próximo quadro aproveitando os rótulos do anterior.
+
+        Args:
+            binary_array: Máscara binária do quadro (objeto = 255, fundo = 0).
+            change_mask: Máscara booleana dos pixels que mudaram desde o quadro
+                         anterior. Se None, é calculada comparando as máscaras.
+
+        Returns:
+            Tupla (rótulos int32, número de objetos). O array de rótulos é o estado
+            interno, atualizado no lugar a cada quadro: copie-o para guardá-lo.
+
+        Raises:
+            ValueError: Se o shape do quadro mudar entre chamadas.
+        """
+        if self.labels is None:
+            labels, num_objects = label_connected_components_runs(binary_array, self.connectivity)
+            self.labels = labels
+            self.max_label = num_objects
+            self._set_bboxes(labels, 0, 0, np.arange(num_objects + 1))
+            return self.labels, num_objects
+        if binary_array.shape != self.labels.shape:
+            raise ValueError(f"Shape do quadro mudou: {self.labels.shape} -> {binary_array.shape}.")
+        if change_mask is None:
+            change_mask = (binary_array == 255) != (self.labels > 0)
+
+        changed_rows = np.flatnonzero(change_mask.any(axis=1))
+        if changed_rows.size == 0:
+            return self.labels, self.num_objects
+        changed_cols = np.flatnonzero(change_mask[changed_rows[0]:changed_rows[-1] + 1].any(axis=0))
+        rows, cols = self.labels.shape
+        region_top, region_bottom = max(changed_rows[0] - 1, 0), min(changed_rows[-1] + 2, rows)
+        region_left, region_right = max(changed_cols[0] - 1, 0), min(changed_cols[-1] + 2, cols)
+
+        # Objetos anteriores que tocam a região, e a janela que os contém
+        affected_ids = np.unique(self.labels[region_top:region_bottom, region_left:region_right])
+        affected_ids = affected_ids[affected_ids > 0]
+        affected_bboxes = self._bboxes[affected_ids]
+        top = min(region_top, affected_bboxes[:, 0].min(initial=rows))
+        left = min(region_left, affected_bboxes[:, 1].min(initial=cols))
+        bottom = max(region_bottom, affected_bboxes[:, 2].max(initial=0))
+        right = max(region_right, affected_bboxes[:, 3].max(initial=0))
+
+        window_labels = self.labels[top:bottom, left:right]
+        is_affected = np.zeros(self.max_label + 1, dtype=bool)
+        is_affected[affected_ids] = True
+        relabel = is_affected[window_labels]
+        relabel[region_top - top:region_bottom - top, region_left - left:region_right - left] = True
+        foreground = (binary_array[top:bottom, left:right] == 255) & relabel
+        local_labels, num_local = label_connected_components_runs(foreground.view(np.uint8) * np.uint8(255),
+                                                                  self.connectivity)
+
+        # Herança de rótulos pela maior sobreposição com os objetos anteriores
+        local_to_id = np.zeros(num_local + 1, dtype=np.int64)
+        overlap = (local_labels > 0) & (window_labels > 0)
+        pair_keys, pair_counts = np.unique(local_labels[overlap].astype(np.int64) * (self.max_label + 1)
+                                           + window_labels[overlap], return_counts=True)
+        used_ids = set()
+        for pair in np.lexsort((pair_keys, -pair_counts)).tolist():
+            local_label, previous_id = divmod(int(pair_keys[pair]), self.max_label + 1)
+            if local_to_id[local_label] == 0 and previous_id not in used_ids:
+                local_to_id[local_label] = previous_id
+                used_ids.add(previous_id)
+        new_labels = np.flatnonzero(local_to_id[1:] == 0) + 1
+        local_to_id[new_labels] = np.arange(self.max_label + 1, self.max_label + 1 + new_labels.size)
+        self.max_label += new_labels.size
+
+        # Objetos anteriores afetados saem por inteiro (estão todos na janela) e os novos entram
+        self._bboxes[affected_ids] = 0
+        window_labels[relabel] = 0
+        window_labels[local_labels > 0] = local_to_id[local_labels[local_labels > 0]]
+        self._set_bboxes(local_labels, top, left, local_to_id)
+        return self.labels, self.num_objects
+
 if __name__ == '__main__':
     # Diretório de entrada e nome da imagem
     input_dir = "/home/andre/dev/processamento_de_imagens_2024-2/2"
@@ -230,14 +1111,27 @@ if __name__ == '__main__':
             binary_image_output_path = os.path.join(output_dir, f"{base_name}_binary.png")
             save_numpy_as_image(binary_image_array, binary_image_output_path)
 
-            binary_matrix_output_path = os.path.join(output_dir, f"{base_name}_binary_matrix.txt")
-            save_array_as_text_matrix(binary_image_array, binary_matrix_output_path)
+            # Máscara em 1 bit por pixel (.bmask); save_array_as_text_matrix gera um arquivo 16x maior
+            binary_mask_output_path = os.path.join(output_dir, f"{base_name}_binary_mask.bmask")
+            save_packed_mask(binary_image_array, binary_mask_output_path)
+            print(f"Máscara binária salva em '{binary_mask_output_path}'")
 
             # 2. Rotular componentes conectados
             print("Rotulando componentes conectados...")
-            labeled_image_array, num_found_objects = label_connected_components_dsu(binary_image_array)
+            labeled_image_array, num_found_objects = label_connected_components_runs(binary_image_array)
             print(f"Número de objetos encontrados: {num_found_objects}")
 
+            gray_image_array = np.array(original_pil_image.convert('L'))
+            for region in region_properties(labeled_image_array, num_found_objects, gray_image_array):
+                print(f"  Objeto {region['label']}: área={region['area']}, "
+                      f"caixa=({region['min_row']}, {region['min_col']})-({region['max_row']}, {region['max_col']}), "
+                      f"centroide=({region['centroid_row']:.1f}, {region['centroid_col']:.1f}), "
+                      f"intensidade média={region['mean_intensity']:.1f}, perímetro={region['perimeter']}")
+
+            compact_labels = LabelMap.from_dense(labeled_image_array, num_found_objects, run_length=True)
+            print(f"Rótulos compactos: {labeled_image_array.nbytes} bytes em int32 -> "
+                  f"{compact_labels.nbytes} bytes em corridas ({compact_labels.dtype})")
+
             # (Opcional) Salvar a imagem rotulada (array numérico) se necessário para análise,
             # mas o plot já a visualiza com colormap.
             # labeled_image_output_path = os.path.join(output_dir, f"{base_name}_labeled_array.png")
@@ -4,6 +4,8 @@ from PIL import Image, UnidentifiedImageError
 import matplotlib.pyplot as plt
 from typing import Tuple, Union, Literal
 
+from binarizacao import binarize_array
+
 # --- Funções Auxiliares Padronizadas ---
 
 def load_pil_image(file_path: str) -> Union[Image.Image, None]:
@@ -64,13 +66,12 @@ def convert_pil_to_grayscale_numpy(image: Image.Image) -> np.ndarray:
 
 def binarize_numpy_array(image_array: np.ndarray, threshold: int = 128) -> np.ndarray:
     """
-    Binariza um array NumPy (0 ou 255).
+    Binariza um array NumPy (0 ou 255): valores >= threshold viram 255.
     Espera-se que a entrada seja um array em escala de cinza.
     """
     if image_array.ndim != 2:
         print("Alerta: Binarização geralmente é aplicada em imagens 2D (escala de cinza).")
-    # Garante que o resultado seja 0 ou 255 e do tipo uint8
-    return np.where(image_array < threshold, 0, 255).astype(np.uint8)
+    return binarize_array(image_array, threshold)
 
 # --- Funções Morfológicas Fundamentais ---
 
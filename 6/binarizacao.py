@@ -0,0 +1,59 @@
+import numpy as np
+from PIL import Image
+
+# Regra única de binarização usada por rotulação, limiarização e morfologia:
+#   pixel de objeto  <=>  valor >= limiar
+# Limiar 0 marca tudo como objeto e 256 não marca nada; "valor > t" equivale a limiar t + 1.
+BINARIZATION_OUTPUTS = ('uint8', 'bool', 'packed')
+
+# --- Binarização ---
+
+def binarize_array(image_gray: np.ndarray, threshold: int = 128, output: str = 'uint8') -> np.ndarray:
+    """
+    Binariza uma imagem em cinza com a regra `valor >= limiar`.
+
+    A comparação gera a máscara booleana em uma passagem (vetorizada, sem tabela:
+    em uint8 ela é bem mais rápida que uma consulta a uma tabela de 256 entradas).
+    A saída 0/255 reinterpreta essa máscara como uint8 e a multiplica por 255 no
+    próprio buffer, sem outra cópia.
+
+    Args:
+        image_gray: Array NumPy 2D em tons de cinza.
+        threshold: Limiar de 0 a 256.
+        output: 'uint8' (0/255, o formato de rotulação e morfologia), 'bool' ou
+                'packed' (np.packbits por linha, 1 bit por pixel, bitorder 'big').
+
+    Returns:
+        Array NumPy binarizado no formato pedido.
+
+    Raises:
+        ValueError: Se o limiar ou a saída forem inválidos.
+    """
+    if not 0 <= threshold <= 256:
+        raise ValueError(f"O limiar deve estar entre 0 e 256, recebido {threshold}.")
+    if output not in BINARIZATION_OUTPUTS:
+        raise ValueError(f"Saída não suportada: '{output}'. Use 'uint8', 'bool' ou 'packed'.")
+
+    foreground = np.greater_equal(image_gray, threshold)
+    if output == 'bool':
+        return foreground
+    if output == 'packed':
+        return np.packbits(foreground, axis=-1)
+    binary = foreground.view(np.uint8)
+    binary *= 255
+    return binary
+
+def binarize_pil(image: Image.Image, threshold: int = 128, output: str = 'uint8') -> np.ndarray:
+    """
+    Binariza uma imagem PIL a partir do buffer decodificado em modo 'L'.
+
+    Args:
+        image: Imagem PIL (convertida para 'L' se necessário).
+        threshold: Limiar de 0 a 256.
+        output: 'uint8', 'bool' ou 'packed' (veja `binarize_array`).
+
+    Returns:
+        Array NumPy binarizado no formato pedido.
+    """
+    image_gray = image if image.mode == 'L' else image.convert('L')
+    return binarize_array(np.asarray(image_gray), threshold, output)
@@ -4,6 +4,8 @@ from PIL import Image, UnidentifiedImageError
 import matplotlib.pyplot as plt
 from typing import Optional # Union and Tuple were not strictly needed here
 
+from binarizacao import binarize_array
+
 
 # --- Funções Auxiliares Padronizadas ---
 
@@ -126,11 +128,8 @@ def manual_thresholding(image_gray_numpy: np.ndarray, threshold_value: int) -> n
         else:
             image_gray_numpy = np.clip(image_gray_numpy, 0, 255).astype(np.uint8)
 
-    # Cria a imagem binária: True onde > threshold_value, False caso contrário
-    binary_image = image_gray_numpy > threshold_value
-    
-    # Converte o array booleano para uint8 (True -> 1, False -> 0) e multiplica por 255
-    return binary_image.astype(np.uint8) * 255
+    # "valor > limiar" é a regra comum (binarizacao.py, "valor >= limiar") com limiar + 1
+    return binarize_array(image_gray_numpy, threshold_value + 1)
 
 
 # --- Função de Plotagem ---